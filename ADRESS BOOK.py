@@ -1,7 +1,1427 @@
 import tkinter as tk
-from tkinter import messagebox, ttk
+from tkinter import filedialog, messagebox, ttk
+import bisect
+import collections
+import csv
+import difflib
+import io
+import itertools
 import json
 import os
+import queue
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+
+def _fsync_dir(path):
+    # Make a rename durable on POSIX; directories can't be opened on Windows
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+CONTACT_FIELDS = ('name', 'phone', 'email', 'address', 'notes')
+# Fields whose values repeat across contacts share one string object
+INTERNED_FIELDS = ('address', 'notes')
+
+
+class Contact:
+    # One contact; replaced rather than mutated so readers on other threads
+    # (search worker, snapshot writer) always see a consistent record
+    __slots__ = ('id',) + CONTACT_FIELDS
+    
+    def __init__(self, contact_id, name='', phone='', email='', address='', notes=''):
+        self.id = contact_id
+        self.name = name
+        self.phone = phone
+        self.email = email
+        self.address = address
+        self.notes = notes
+    
+    def get(self, field, default=''):
+        return getattr(self, field) if field in CONTACT_FIELDS else default
+    
+    def to_dict(self):
+        return {field: getattr(self, field) for field in CONTACT_FIELDS}
+
+
+class ContactStore:
+    # Contacts by stable integer id. The dict keeps insertion order, and
+    # lookup, update and delete by id are O(1).
+    def __init__(self):
+        self._records = {}
+        self._strings = {}
+        self.next_id = 1
+    
+    def __len__(self):
+        return len(self._records)
+    
+    def __iter__(self):
+        return iter(self._records.values())
+    
+    def __contains__(self, contact_id):
+        return contact_id in self._records
+    
+    def ids(self):
+        return self._records.keys()
+    
+    def get(self, contact_id):
+        return self._records[contact_id]
+    
+    def _make(self, contact_id, fields):
+        values = []
+        for field in CONTACT_FIELDS:
+            value = str(fields.get(field) or '')
+            if field in INTERNED_FIELDS:
+                value = self._strings.setdefault(value, value)
+            values.append(value)
+        return Contact(contact_id, *values)
+    
+    def add(self, fields, contact_id=None):
+        if contact_id is None:
+            contact_id = self.next_id
+        self.next_id = max(self.next_id, contact_id + 1)
+        contact = self._make(contact_id, fields)
+        self._records[contact_id] = contact
+        return contact
+    
+    def update(self, contact_id, fields):
+        contact = self._make(contact_id, fields)
+        self._records[contact_id] = contact
+        return contact
+    
+    def delete(self, contact_id):
+        return self._records.pop(contact_id)
+
+
+class ContactJournal:
+    # Append-only change log on top of a JSON snapshot.
+    # Every add/update/delete is one line in <data_file>.journal; fsyncs are
+    # batched and the log is periodically folded back into the snapshot by a
+    # background thread.
+    def __init__(self, snapshot_path, fsync_batch=64, fsync_interval=0.5, compact_min=1000):
+        self.snapshot_path = snapshot_path
+        self.journal_path = snapshot_path + ".journal"
+        self.rotated_path = self.journal_path + ".1"
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+        self.compact_min = compact_min
+        
+        self.lock = threading.RLock()
+        self.seq = 0
+        self.pending_records = 0
+        self._file = None
+        self._unsynced = 0
+        self._sync_timer = None
+        self._compactor = None
+        self.skipped_records = 0
+    
+    def load(self):
+        contacts = ContactStore()
+        seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+            # Plain lists are snapshots written before the journal existed
+            if isinstance(data, list):
+                for fields in data:
+                    contacts.add(fields)
+            else:
+                for fields in data['contacts']:
+                    contacts.add(fields, fields.get('id'))
+                contacts.next_id = max(contacts.next_id, data.get('next_id', 1))
+                seq = data['seq']
+        
+        replayed = 0
+        self.skipped_records = 0
+        legacy_order = None
+        for path in (self.rotated_path, self.journal_path):
+            if not os.path.exists(path):
+                continue
+            good_end = end = 0
+            bad = 0
+            with open(path, 'rb') as file:
+                for line in file:
+                    end += len(line)
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete record")
+                        record = json.loads(line)
+                        if not isinstance(record, dict) or not isinstance(record.get('seq'), int):
+                            raise ValueError("not a journal record")
+                    except ValueError:
+                        # Skipped if valid records follow it; if not, it is a
+                        # torn tail from a crash mid-write and is cut off below
+                        bad += 1
+                        continue
+                    self.skipped_records += bad
+                    bad = 0
+                    good_end = end
+                    if record['seq'] <= seq:
+                        continue
+                    seq = record['seq']
+                    try:
+                        if 'index' in record:
+                            # Positional record from before contacts had ids
+                            if legacy_order is None:
+                                legacy_order = list(contacts.ids())
+                            record['id'] = legacy_order[record['index']]
+                            if record['op'] == 'delete':
+                                del legacy_order[record['index']]
+                        contact = self._apply(contacts, record)
+                    except (KeyError, IndexError):
+                        # Refers to a contact whose record was skipped
+                        self.skipped_records += 1
+                        continue
+                    if legacy_order is not None and record['op'] == 'add':
+                        legacy_order.append(contact.id)
+                    replayed += 1
+            if good_end < os.path.getsize(path):
+                with open(path, 'r+b') as file:
+                    file.truncate(good_end)
+        if self.skipped_records:
+            print(f"{self.journal_path}: skipped {self.skipped_records} unreadable records", file=sys.stderr)
+        
+        self.seq = seq
+        self.pending_records = replayed
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        
+        # A compaction was interrupted, or the log predates contact ids;
+        # either way it is already replayed above
+        if os.path.exists(self.rotated_path) or legacy_order is not None:
+            self.compact(contacts, background=False)
+        return contacts
+    
+    @staticmethod
+    def _apply(contacts, record):
+        op = record['op']
+        if op == 'add':
+            return contacts.add(record['contact'], record.get('id'))
+        elif op == 'update':
+            return contacts.update(record['id'], record['contact'])
+        elif op == 'delete':
+            return contacts.delete(record['id'])
+    
+    def append(self, op, **fields):
+        self.append_many([(op, fields)])
+    
+    def append_many(self, changes):
+        with self.lock:
+            lines = []
+            for op, fields in changes:
+                self.seq += 1
+                record = {'seq': self.seq, 'op': op}
+                record.update(fields)
+                lines.append(json.dumps(record, separators=(',', ':')))
+            if not lines:
+                return
+            self._file.write("\n".join(lines) + "\n")
+            self._file.flush()
+            self.pending_records += len(lines)
+            self._unsynced += len(lines)
+            
+            if self._unsynced >= self.fsync_batch:
+                self._sync_locked()
+            elif self._sync_timer is None:
+                self._sync_timer = threading.Timer(self.fsync_interval, self.sync)
+                self._sync_timer.daemon = True
+                self._sync_timer.start()
+    
+    def sync(self):
+        with self.lock:
+            self._sync_locked()
+    
+    def _sync_locked(self):
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+    
+    def maybe_compact(self, contacts):
+        if self.pending_records >= max(self.compact_min, len(contacts) // 2):
+            self.compact(contacts)
+    
+    def compact(self, contacts, background=True):
+        with self.lock:
+            if self._compactor is not None and self._compactor.is_alive():
+                if background:
+                    return
+                # A foreground compaction has to cover everything logged so
+                # far, so it waits for the snapshot already being written
+                # (which never takes the lock) and then writes its own
+                self._compactor.join()
+            # Freeze the log: everything in it is covered by this snapshot,
+            # new records go to a fresh journal while the snapshot is written
+            self._sync_locked()
+            self._file.close()
+            if os.path.exists(self.rotated_path):
+                # Previous snapshot write failed; keep its log in front
+                with open(self.journal_path, 'r', encoding='utf-8') as src, \
+                        open(self.rotated_path, 'a', encoding='utf-8') as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(self.journal_path)
+            else:
+                os.replace(self.journal_path, self.rotated_path)
+            self._file = open(self.journal_path, 'a', encoding='utf-8')
+            snapshot = list(contacts)
+            seq = self.seq
+            next_id = contacts.next_id
+            self.pending_records = 0
+        
+        if background:
+            self._compactor = threading.Thread(target=self._write_snapshot, args=(snapshot, seq, next_id),
+                                               daemon=True)
+            self._compactor.start()
+        else:
+            self._write_snapshot(snapshot, seq, next_id)
+    
+    def _write_snapshot(self, contacts, seq, next_id):
+        tmp_path = self.snapshot_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as file:
+            file.write(f'{{"seq":{seq},"next_id":{next_id},"contacts":[')
+            for start in range(0, len(contacts), 1000):
+                records = []
+                for contact in contacts[start:start + 1000]:
+                    record = contact.to_dict()
+                    record['id'] = contact.id
+                    records.append(json.dumps(record, separators=(',', ':')))
+                file.write(("," if start else "") + ",".join(records))
+            file.write("]}")
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_dir(self.snapshot_path)
+        os.remove(self.rotated_path)
+    
+    def close(self):
+        if self._compactor is not None:
+            self._compactor.join()
+        with self.lock:
+            self._sync_locked()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+SEARCH_FIELDS = ('name', 'phone', 'email', 'address')
+PHONE_CHARS = set("0123456789+-() ")
+
+
+def _digits(text):
+    return ''.join(ch for ch in text if ch.isdigit())
+
+
+class SearchCancelled(Exception):
+    pass
+
+
+def _check_cancelled(cancelled):
+    if cancelled is not None and cancelled():
+        raise SearchCancelled()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ContactSearchIndex:
+    # Trigram posting lists over name, email, address and the digits of the
+    # phone number, a sorted name list for prefix hits and 1-2 character word
+    # prefixes for very short queries. Kept in step with the contact list on
+    # every add/edit/delete/import. A search looks at no more than max_scan
+    # candidates after the name-prefix hits.
+    def __init__(self, max_results=500, max_scan=5000):
+        self.max_results = max_results
+        self.max_scan = max_scan
+        self.lock = threading.Lock()
+        self._grams = {}
+        self._pieces = {}
+        self._prefixes = {}
+        self._names = []
+        self._new_names = []
+        self._docs = {}
+    
+    @staticmethod
+    def _texts(contact):
+        return contact.name.lower(), _digits(contact.phone), contact.email.lower(), contact.address.lower()
+    
+    @staticmethod
+    def _all_trigrams(texts):
+        grams = set()
+        for text in texts:
+            grams.update(text[i:i + 3] for i in range(len(text) - 2))
+        return grams
+    
+    @staticmethod
+    def _short_prefixes(texts):
+        name, phone, email, address = texts
+        prefixes = {phone[:1], phone[:2]}
+        for text in (name, email, address):
+            for word in text.split():
+                prefixes.add(word[:1])
+                prefixes.add(word[:2])
+        prefixes.discard('')
+        return prefixes
+    
+    def add(self, contact):
+        self.add_many([contact])
+    
+    def add_many(self, contacts):
+        with self.lock:
+            names = []
+            for contact in contacts:
+                # Small sequential ids keep the posting sets cache friendly
+                key = contact.id
+                texts = self._texts(contact)
+                self._docs[key] = (contact, texts)
+                names.append((texts[0], key))
+                
+                for gram in self._all_trigrams(texts):
+                    postings = self._grams.get(gram)
+                    if postings is None:
+                        self._grams[gram] = {key}
+                        for piece in {gram[0], gram[1], gram[2], gram[:2], gram[1:]}:
+                            self._pieces.setdefault(piece, set()).add(gram)
+                    else:
+                        postings.add(key)
+                for prefix in self._short_prefixes(texts):
+                    postings = self._prefixes.get(prefix)
+                    if postings is None:
+                        self._prefixes[prefix] = {key}
+                    else:
+                        postings.add(key)
+            
+            if len(names) > 64:
+                # Merged into the sorted list only when a lookup needs it, so
+                # a load or import in many batches sorts once, not per batch
+                self._new_names.extend(names)
+            else:
+                for entry in names:
+                    bisect.insort(self._sorted_names(), entry)
+    
+    def _sorted_names(self):
+        # Caller holds the lock
+        if self._new_names:
+            self._new_names.sort()
+            self._names.extend(self._new_names)
+            self._new_names = []
+            # Two sorted runs: Timsort merges them in one linear pass
+            self._names.sort()
+        return self._names
+    
+    def remove(self, contact):
+        with self.lock:
+            entry = self._docs.pop(contact.id, None)
+            if entry is None:
+                return
+            key = contact.id
+            texts = entry[1]
+            
+            names = self._sorted_names()
+            pos = bisect.bisect_left(names, (texts[0], key))
+            del names[pos]
+            for gram in self._all_trigrams(texts):
+                postings = self._grams[gram]
+                postings.discard(key)
+                if not postings:
+                    del self._grams[gram]
+                    for piece in {gram[0], gram[1], gram[2], gram[:2], gram[1:]}:
+                        self._pieces[piece].discard(gram)
+            for prefix in self._short_prefixes(texts):
+                postings = self._prefixes[prefix]
+                postings.discard(key)
+                if not postings:
+                    del self._prefixes[prefix]
+    
+    def replace(self, old_contact, new_contact):
+        self.remove(old_contact)
+        self.add(new_contact)
+    
+    def _candidates(self, grams):
+        # Walks the smallest posting list lazily and keeps the keys that are
+        # in every other one, so a caller can stop as soon as it has enough
+        postings = [self._grams.get(gram) for gram in grams]
+        if not postings or None in postings:
+            return
+        postings.sort(key=len)
+        first, rest = postings[0], postings[1:]
+        for key in first:
+            if all(key in other for other in rest):
+                yield key
+    
+    @staticmethod
+    def _rank(texts, term, digits):
+        # 0: name starts with the term, 1: some word/phone starts with it,
+        # 2: plain substring match, None: no match
+        name, phone, email, address = texts
+        if name.startswith(term):
+            return 0
+        if digits and phone.startswith(digits):
+            return 1
+        # A word starts with the term when the term follows a space
+        spaced = ' ' + term
+        if spaced in name or email.startswith(term) or spaced in email or address.startswith(term) or spaced in address:
+            return 1
+        if term in name or term in email or term in address or (digits and digits in phone):
+            return 2
+        return None
+    
+    def _name_prefix_keys(self, term, limit):
+        keys = []
+        names = self._sorted_names()
+        pos = bisect.bisect_left(names, (term,))
+        while pos < len(names) and len(keys) < limit:
+            name, key = names[pos]
+            if not name.startswith(term):
+                break
+            keys.append(key)
+            pos += 1
+        return keys
+    
+    def search(self, term, limit=None, cancelled=None):
+        term = term.strip().lower()
+        limit = limit or self.max_results
+        if not term:
+            return []
+        digits = _digits(term) if set(term) <= PHONE_CHARS else ''
+        
+        with self.lock:
+            # Names starting with the term come first, already in name order
+            found = self._name_prefix_keys(term, limit)
+            if len(found) < limit:
+                if len(term) >= 3:
+                    keys = self._candidates(_trigrams(term))
+                    if len(digits) >= 3 and digits != term:
+                        keys = itertools.chain(keys, self._candidates(_trigrams(digits)))
+                else:
+                    # Too short for trigrams: word-prefix hits, then (from two
+                    # characters on) any substring hit from the trigrams
+                    # containing the term
+                    short = digits or term
+                    keys = self._prefixes.get(short, ())
+                    if len(short) > 1:
+                        keys = itertools.chain(keys, (key for gram in self._pieces.get(short, ())
+                                                      for key in self._grams[gram]))
+                found.extend(self._collect(keys, set(found), term, digits, limit - len(found), cancelled))
+            return [self._docs[key][0] for key in found]
+    
+    def _collect(self, keys, seen, term, digits, want, cancelled=None):
+        # Verifies candidates as they come and stops at `want` hits or after
+        # max_scan candidates, so a common term costs the same as a rare one.
+        # The hits are ranked among themselves.
+        matches = []
+        for scanned, key in enumerate(keys):
+            if scanned >= self.max_scan:
+                break
+            if not scanned & 1023:
+                _check_cancelled(cancelled)
+            if key in seen:
+                continue
+            seen.add(key)
+            texts = self._docs[key][1]
+            rank = self._rank(texts, term, digits)
+            if rank is not None:
+                matches.append((rank, texts[0], key))
+                if len(matches) >= want:
+                    break
+        matches.sort()
+        return [key for rank, name, key in matches]
+
+
+class SearchExecutor:
+    # Runs searches off the Tk thread. Keystrokes are debounced, only the
+    # newest term is searched, older in-flight searches are cancelled and
+    # results come back through a queue that the Tk thread polls with
+    # root.after (Tk must not be called from the worker), so stale ones are
+    # never drawn. A search that fails reaches on_error the same way.
+    def __init__(self, root, search_fn, on_result, on_error=None, debounce_ms=120, history=200, poll_ms=10):
+        self.root = root
+        self.search_fn = search_fn
+        self.on_result = on_result
+        self.on_error = on_error
+        self.debounce_ms = debounce_ms
+        self.poll_ms = poll_ms
+        self.latencies = collections.deque(maxlen=history)
+        self._generation = 0
+        self._pending = None
+        self._awaiting = None
+        self._poll_job = None
+        self._queue = queue.Queue()
+        self._results = queue.Queue()
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+    
+    def submit(self, term, delay=None):
+        self.cancel()
+        generation = self._generation
+        submitted = time.perf_counter()
+        self._pending = self.root.after(self.debounce_ms if delay is None else delay,
+                                        self._dispatch, generation, term, submitted)
+    
+    def cancel(self):
+        # Bumping the generation makes every queued or running search stale
+        self._generation += 1
+        if self._pending is not None:
+            self.root.after_cancel(self._pending)
+            self._pending = None
+    
+    def _dispatch(self, generation, term, submitted):
+        self._pending = None
+        self._awaiting = generation
+        self._queue.put((generation, term, submitted))
+        if self._poll_job is None:
+            self._poll_job = self.root.after(self.poll_ms, self._poll)
+    
+    def _poll(self):
+        # Runs on the Tk thread until the newest search has been delivered
+        self._poll_job = None
+        while True:
+            try:
+                result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._deliver(*result)
+        if self._awaiting is not None and self._awaiting == self._generation:
+            self._poll_job = self.root.after(self.poll_ms, self._poll)
+    
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            while not self._queue.empty():
+                job = self._queue.get_nowait()
+            generation, term, submitted = job
+            if generation != self._generation:
+                continue
+            
+            started = time.perf_counter()
+            error = None
+            try:
+                result = self.search_fn(term, cancelled=lambda: generation != self._generation)
+            except SearchCancelled:
+                continue
+            except Exception as e:
+                # Delivered like a result so the poller stops waiting for it
+                result, error = [], e
+            finished = time.perf_counter()
+            self._results.put((generation, term, result, error, submitted, started, finished))
+    
+    def _deliver(self, generation, term, result, error, submitted, started, finished):
+        if generation != self._generation:
+            return
+        self._awaiting = None
+        if error is not None:
+            if self.on_error is not None:
+                self.on_error(term, error)
+            return
+        self.latencies.append({
+            'term': term,
+            'results': len(result),
+            'wait_ms': (started - submitted) * 1000,
+            'search_ms': (finished - started) * 1000,
+            'total_ms': (time.perf_counter() - submitted) * 1000,
+        })
+        self.on_result(term, result)
+    
+    def stats(self):
+        if not self.latencies:
+            return {}
+        report = {'queries': len(self.latencies)}
+        for field in ('search_ms', 'total_ms'):
+            values = sorted(entry[field] for entry in self.latencies)
+            report[field] = {
+                'p50': values[len(values) // 2],
+                'p95': values[min(len(values) - 1, int(len(values) * 0.95))],
+                'max': values[-1],
+            }
+        return report
+
+
+class VirtualTreeview:
+    # Shows a long list of items in a Treeview while only materializing the
+    # rows that fit in the viewport. The scrollbar tracks the position in
+    # the full list; refreshes apply an insert/delete/move diff to the rows
+    # on screen and keep the selected item selected.
+    def __init__(self, tree, scrollbar, key_fn, row_fn):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.key_fn = key_fn
+        self.row_fn = row_fn
+        self.items = []
+        self.offset = 0
+        self.visible = 20
+        self.selected = None
+        self._rendered = {}
+        self._window = []
+        
+        style = ttk.Style()
+        self.row_height = int(style.lookup('Treeview', 'rowheight') or 20)
+        self.header_height = 25
+        
+        self.tree.configure(yscrollcommand='')
+        self.scrollbar.configure(command=self.yview)
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select, add='+')
+        self.tree.bind('<MouseWheel>', self._on_wheel)
+        self.tree.bind('<Button-4>', lambda e: self.yview('scroll', -3, 'units'))
+        self.tree.bind('<Button-5>', lambda e: self.yview('scroll', 3, 'units'))
+        self.tree.bind('<Up>', lambda e: self._step(-1))
+        self.tree.bind('<Down>', lambda e: self._step(1))
+        self.tree.bind('<Prior>', lambda e: self._step(-self.visible))
+        self.tree.bind('<Next>', lambda e: self._step(self.visible))
+    
+    def set_items(self, items):
+        self.items = items
+        if self.selected is not None:
+            key = self.key_fn(self.selected)
+            window = self.items[self.offset:self.offset + self.visible]
+            position = next((i for i, item in enumerate(window) if self.key_fn(item) == key), None)
+            if position is None:
+                # Selection moved out of view: scroll so it stays on screen
+                position = next((i for i, item in enumerate(self.items) if self.key_fn(item) == key), None)
+                if position is None:
+                    self.selected = None
+                else:
+                    self.offset = position
+        self._clamp()
+        self._render()
+    
+    def select(self, item):
+        self.selected = item
+        self.set_items(self.items)
+    
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.offset = int(float(args[1]) * len(self.items))
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= self.visible
+            self.offset += amount
+        self._clamp()
+        self._render()
+    
+    def _clamp(self):
+        self.offset = max(0, min(self.offset, len(self.items) - self.visible))
+    
+    def _render(self):
+        window = self.items[self.offset:self.offset + self.visible]
+        keys = [self.key_fn(item) for item in window]
+        wanted = set(keys)
+        
+        stale = [iid for iid in self._window if iid not in wanted]
+        if stale:
+            self.tree.delete(*stale)
+            for iid in stale:
+                del self._rendered[iid]
+        order = [iid for iid in self._window if iid in wanted]
+        
+        for index, (iid, item) in enumerate(zip(keys, window)):
+            row = self.row_fn(item, self.offset + index)
+            if iid not in self._rendered:
+                self.tree.insert('', index, iid=iid, text=row[0], values=row[1])
+                order.insert(index, iid)
+            else:
+                if order[index] != iid:
+                    self.tree.move(iid, '', index)
+                    order.remove(iid)
+                    order.insert(index, iid)
+                if self._rendered[iid] != row:
+                    self.tree.item(iid, text=row[0], values=row[1])
+            self._rendered[iid] = row
+        self._window = keys
+        
+        selected_key = self.key_fn(self.selected) if self.selected is not None else None
+        if selected_key in wanted:
+            if self.tree.selection() != (selected_key,):
+                self.tree.selection_set(selected_key)
+        elif self.tree.selection():
+            self.tree.selection_remove(*self.tree.selection())
+        
+        if self.items:
+            self.scrollbar.set(self.offset / len(self.items),
+                               min(1.0, (self.offset + self.visible) / len(self.items)))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+    
+    def _on_resize(self, event):
+        visible = max(1, (event.height - self.header_height) // self.row_height)
+        if visible != self.visible:
+            self.visible = visible
+            self._clamp()
+            self._render()
+    
+    def _on_select(self, event):
+        selection = self.tree.selection()
+        if selection:
+            window = self.items[self.offset:self.offset + self.visible]
+            self.selected = next((item for item in window if self.key_fn(item) == selection[0]), self.selected)
+        elif self.selected is not None and self.key_fn(self.selected) in self._window:
+            # Deselected while on screen (rows scrolled away keep it)
+            self.selected = None
+    
+    def _on_wheel(self, event):
+        self.yview('scroll', -1 if event.delta > 0 else 1, 'units')
+        return "break"
+    
+    def _step(self, amount):
+        if not self.items:
+            return "break"
+        position = 0
+        if self.selected is not None:
+            key = self.key_fn(self.selected)
+            window = self.items[self.offset:self.offset + self.visible]
+            position = next((self.offset + i for i, item in enumerate(window) if self.key_fn(item) == key),
+                            self.offset)
+            position += amount
+        position = max(0, min(position, len(self.items) - 1))
+        self.selected = self.items[position]
+        if position < self.offset:
+            self.offset = position
+        elif position >= self.offset + self.visible:
+            self.offset = position - self.visible + 1
+        self._clamp()
+        self._render()
+        return "break"
+
+
+CONTACT_FILETYPES = [("JSON files", "*.json"), ("NDJSON files", "*.ndjson *.jsonl"),
+                     ("CSV files", "*.csv"), ("All files", "*.*")]
+
+
+def contact_file_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.ndjson', '.jsonl'):
+        return 'ndjson'
+    if ext == '.csv':
+        return 'csv'
+    return 'json'
+
+
+def normalize_contact(record):
+    # Imported records must be objects with a name; everything is kept as text
+    if not isinstance(record, dict):
+        return None
+    contact = {field: str(record.get(field) or '').strip() for field in CONTACT_FIELDS}
+    if not contact['name']:
+        return None
+    return contact
+
+
+def iter_json_array(file, chunk_size=1 << 16):
+    # Yields the elements of a top-level JSON array without loading the file
+    decoder = json.JSONDecoder()
+    buffer, pos, eof = '', 0, False
+    expect = '['
+    while True:
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer) or eof:
+                break
+            chunk = file.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+        if pos >= len(buffer):
+            raise ValueError("Unexpected end of contacts file")
+        
+        char = buffer[pos]
+        if expect == '[':
+            if char != '[':
+                raise ValueError("Invalid contacts format")
+            pos += 1
+            expect = 'first'
+            continue
+        if char == ']' and expect in ('first', 'next'):
+            return
+        if expect == 'next':
+            if char != ',':
+                raise ValueError(f"Expected ',' in contacts file, got {char!r}")
+            pos += 1
+            expect = 'value'
+            continue
+        
+        while True:
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+                # A number cut at the buffer edge would decode short
+                if end < len(buffer) or eof:
+                    break
+            except ValueError:
+                if eof:
+                    raise
+            chunk = file.read(chunk_size)
+            buffer, pos, eof = buffer[pos:] + chunk, 0, not chunk
+        yield value
+        pos = end
+        expect = 'next'
+
+
+def iter_ndjson(file):
+    for line in file:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield None
+
+
+def iter_csv(file):
+    for row in csv.DictReader(file):
+        yield {(key or '').strip().lower(): value for key, value in row.items()}
+
+
+def read_contact_batches(path, cancelled, batch_size=500):
+    # Yields (valid contacts, rejected count, fraction of the file read)
+    size = os.path.getsize(path) or 1
+    with open(path, 'rb') as raw:
+        text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+        readers = {'ndjson': iter_ndjson, 'csv': iter_csv, 'json': iter_json_array}
+        records = readers[contact_file_format(path)](text)
+        while not cancelled.is_set():
+            batch = list(itertools.islice(records, batch_size))
+            if not batch:
+                return
+            valid = [contact for contact in map(normalize_contact, batch) if contact is not None]
+            yield valid, len(batch) - len(valid), min(1.0, raw.tell() / size)
+
+
+def write_contact_batches(path, contacts, cancelled, batch_size=500):
+    # Streams contacts to a temp file and swaps it in only once complete
+    fmt = contact_file_format(path)
+    tmp_path = path + ".part"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='') as file:
+            writer = None
+            if fmt == 'csv':
+                writer = csv.DictWriter(file, fieldnames=CONTACT_FIELDS, extrasaction='ignore')
+                writer.writeheader()
+            elif fmt == 'json':
+                file.write("[\n")
+            
+            for start in range(0, len(contacts), batch_size):
+                if cancelled.is_set():
+                    break
+                batch = [contact.to_dict() for contact in contacts[start:start + batch_size]]
+                if writer is not None:
+                    writer.writerows(batch)
+                elif fmt == 'ndjson':
+                    file.write("".join(json.dumps(contact) + "\n" for contact in batch))
+                else:
+                    file.write(("," if start else "") + ",\n".join(map(json.dumps, batch)) + "\n")
+                yield batch, 0, (start + len(batch)) / len(contacts)
+            
+            if fmt == 'json':
+                file.write("]\n")
+        if cancelled.is_set():
+            os.remove(tmp_path)
+        else:
+            os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+SOUNDEX_CODES = {ch: str(code) for code, letters in enumerate(
+    ['aeiouyhw', 'bfpv', 'cgjkqsxz', 'dt', 'l', 'mn', 'r']) for ch in letters}
+
+
+def soundex(word):
+    letters = [ch for ch in word.lower() if ch in SOUNDEX_CODES]
+    if not letters:
+        return ''
+    code = letters[0].upper()
+    last = SOUNDEX_CODES[letters[0]]
+    for ch in letters[1:]:
+        digit = SOUNDEX_CODES[ch]
+        if digit != '0' and digit != last:
+            code += digit
+        if ch not in 'hw':
+            last = digit
+    return (code + '000')[:4]
+
+
+NAME_JUNK = re.compile(r"[^\w\s]")
+
+
+def normalize_phone(phone):
+    # Compare on the last ten digits so "+91 98..." and "098..." match
+    digits = _digits(phone)
+    return digits[-10:] if len(digits) >= 7 else ''
+
+
+def normalize_name(name):
+    return ' '.join(NAME_JUNK.sub('', name.lower()).split())
+
+
+def _comparable(field, value):
+    # The form two values of a field are compared in when checking whether
+    # one record could be the other
+    if field == 'phone':
+        return normalize_phone(value) or _digits(value)
+    if field == 'email':
+        return value.strip().lower()
+    return ' '.join(value.split())
+
+
+class ContactMerger:
+    # Duplicate detection for imports in near-linear time: exact matches come
+    # from hash indexes on normalized phone and email, fuzzy name matches are
+    # only compared inside a small phonetic block (Soundex of first and last
+    # name), never against the whole book. A record with the same normalized
+    # name as a contact whose other fields agree with it is the same contact.
+    # Existing contacts are keyed by id, records added by the import itself by
+    # negative placeholder keys.
+    def __init__(self, name_threshold=0.6, fuzzy_threshold=0.88, block_limit=10, max_examples=10):
+        self.name_threshold = name_threshold
+        self.fuzzy_threshold = fuzzy_threshold
+        self.block_limit = block_limit
+        self.max_examples = max_examples
+        self.records = {}
+        self.names = {}
+        self._next_new = -1
+        self.by_phone = {}
+        self.by_email = {}
+        self.by_name = {}
+        self.by_block = {}
+        self.summary = {'added': 0, 'merged': 0, 'skipped': 0, 'flagged': 0}
+        self.flagged = []
+    
+    @staticmethod
+    def _block(name):
+        words = name.split()
+        if not words:
+            return ''
+        return soundex(words[0]) + soundex(words[-1])
+    
+    def add_existing(self, contacts):
+        for contact in contacts:
+            self._append(contact.id, contact)
+    
+    def _append(self, pos, contact):
+        self.records[pos] = contact
+        self.names[pos] = normalize_name(contact.get('name', ''))
+        self._index(pos, contact)
+    
+    def _index(self, pos, contact):
+        phone = normalize_phone(contact.get('phone', ''))
+        email = contact.get('email', '').strip().lower()
+        name = self.names[pos]
+        if phone:
+            self.by_phone.setdefault(phone, pos)
+        if email:
+            self.by_email.setdefault(email, pos)
+        same_name = self.by_name.setdefault(name, [])
+        if pos not in same_name:
+            same_name.append(pos)
+        block = self.by_block.setdefault(self._block(name), collections.deque(maxlen=self.block_limit))
+        if pos not in block:
+            block.append(pos)
+    
+    @staticmethod
+    def _similar(matcher, other, threshold):
+        # The incoming name is seq2, whose lookup tables difflib caches
+        matcher.set_seq1(other)
+        return matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold \
+            and matcher.ratio() >= threshold
+    
+    def _flag(self, contact, existing):
+        self.summary['flagged'] += 1
+        if len(self.flagged) < self.max_examples:
+            self.flagged.append((contact.get('name'), existing.get('name')))
+    
+    @staticmethod
+    def _conflicts(current, contact):
+        return any(value and current.get(field) and _comparable(field, value) != _comparable(field, current[field])
+                   for field, value in contact.items() if field != 'name')
+    
+    def _fill(self, pos, contact):
+        # Copies the fields the kept record is missing; nothing new is a skip
+        existing = self.records[pos]
+        current = existing.to_dict() if isinstance(existing, Contact) else existing
+        merged = dict(current)
+        for field, value in contact.items():
+            if value and not merged.get(field):
+                merged[field] = value
+        if merged == current:
+            self.summary['skipped'] += 1
+            return ('skip', pos, existing)
+        self.records[pos] = merged
+        self._index(pos, merged)
+        self.summary['merged'] += 1
+        return ('merge', pos, merged)
+    
+    def merge(self, contact):
+        # Returns ('add', key, contact), ('merge', key, merged) or ('skip', key, existing)
+        name = normalize_name(contact['name'])
+        matcher = difflib.SequenceMatcher(None, '', name, autojunk=False)
+        phone = normalize_phone(contact.get('phone', ''))
+        email = contact.get('email', '').strip().lower()
+        
+        pos = self.by_phone.get(phone) if phone else None
+        if pos is None and email:
+            pos = self.by_email.get(email)
+        if pos is not None:
+            if self._similar(matcher, self.names[pos], self.name_threshold):
+                return self._fill(pos, contact)
+            # Same number or address but clearly another person
+            self._flag(contact, self.records[pos])
+        else:
+            same_name = self.by_name.get(name, ())
+            for other in same_name:
+                current = self.records[other]
+                if not self._conflicts(current.to_dict() if isinstance(current, Contact) else current, contact):
+                    return self._fill(other, contact)
+            if same_name:
+                # Same name, but a phone, email or address that disagrees
+                match = same_name[0]
+            else:
+                match = next((other for other in self.by_block.get(self._block(name), ())
+                              if self._similar(matcher, self.names[other], self.fuzzy_threshold)), None)
+            if match is not None:
+                self._flag(contact, self.records[match])
+        
+        pos = self._next_new
+        self._next_new -= 1
+        self._append(pos, contact)
+        self.summary['added'] += 1
+        return ('add', pos, contact)
+
+
+def merge_contact_batches(batches, existing):
+    # Wraps read_contact_batches, turning each batch into merge decisions
+    merger = ContactMerger()
+    merger.add_existing(existing)
+    for contacts, rejected, fraction in batches:
+        yield [merger.merge(contact) for contact in contacts], rejected, fraction, merger
+
+
+class BatchJob:
+    # Runs a batch generator on a worker thread. Batches pass to the Tk thread
+    # through a small bounded queue polled with root.after, so a busy UI
+    # throttles the reader and memory stays constant.
+    def __init__(self, root, batches, on_batch, on_done, max_pending=4, poll_ms=30):
+        self.root = root
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.poll_ms = poll_ms
+        self.cancelled = threading.Event()
+        self._queue = queue.Queue(max_pending)
+        self._thread = threading.Thread(target=self._run, args=(batches,), daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+    
+    def cancel(self):
+        self.cancelled.set()
+    
+    def _put(self, message):
+        while True:
+            try:
+                self._queue.put(message, timeout=0.1)
+                return
+            except queue.Full:
+                if self.cancelled.is_set() and message[0] == 'batch':
+                    return
+    
+    def _run(self, batches):
+        try:
+            for batch in batches(self.cancelled):
+                if self.cancelled.is_set():
+                    break
+                self._put(('batch', batch))
+        except Exception as e:
+            self._put(('done', e))
+        else:
+            self._put(('done', None))
+    
+    def _poll(self):
+        # Drain a few batches per tick so the UI keeps breathing
+        for _ in range(2):
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'done':
+                self.on_done(payload, self.cancelled.is_set())
+                return
+            if not self.cancelled.is_set():
+                self.on_batch(*payload)
+        self.root.after(self.poll_ms, self._poll)
+
+
+class ContactBookCore:
+    # Everything the contact book does to its data, with no Tk involved.
+    # The GUI calls into this and the benchmark drives it directly.
+    def __init__(self, data_file="contacts.json"):
+        self.data_file = data_file
+        self.journal = ContactJournal(data_file)
+        self.contacts = ContactStore()
+        self.search_index = ContactSearchIndex()
+    
+    def load(self):
+        for _ in self.load_batches(threading.Event()):
+            pass
+    
+    def load_batches(self, cancelled, batch_size=20000):
+        # Runs on a worker thread: replay the snapshot and journal, then
+        # index in slices so the list can fill in while the rest is indexed
+        self.contacts = self.journal.load()
+        self.search_index = ContactSearchIndex()
+        records = list(self.contacts)
+        for start in range(0, len(records), batch_size):
+            if cancelled.is_set():
+                return
+            batch = records[start:start + batch_size]
+            self.search_index.add_many(batch)
+            yield batch, (start + len(batch)) / len(records)
+    
+    def close(self):
+        self.journal.close()
+    
+    def checkpoint(self, background=True):
+        self.journal.compact(self.contacts, background=background)
+    
+    def all_contacts(self):
+        return list(self.contacts)
+    
+    def get(self, contact_id):
+        return self.contacts.get(contact_id)
+    
+    def search(self, term, limit=None, cancelled=None):
+        return self.search_index.search(term, limit=limit, cancelled=cancelled)
+    
+    def _log(self, op, **fields):
+        self.journal.append(op, **fields)
+        self.journal.maybe_compact(self.contacts)
+    
+    def add(self, fields):
+        if not fields.get('name'):
+            raise ValueError("Name is required")
+        contact = self.contacts.add(fields)
+        self.search_index.add(contact)
+        self._log('add', id=contact.id, contact=contact.to_dict())
+        return contact
+    
+    def update(self, contact_id, fields):
+        if not fields.get('name'):
+            raise ValueError("Name is required")
+        old = self.contacts.get(contact_id)
+        contact = self.contacts.update(contact_id, fields)
+        self.search_index.replace(old, contact)
+        self._log('update', id=contact_id, contact=contact.to_dict())
+        return contact
+    
+    def delete(self, contact_id):
+        contact = self.contacts.delete(contact_id)
+        self.search_index.remove(contact)
+        self._log('delete', id=contact_id)
+        return contact
+    
+    def import_batches(self, path, cancelled):
+        # Runs on a worker thread: parse, validate and decide merges
+        return merge_contact_batches(read_contact_batches(path, cancelled), self.all_contacts())
+    
+    def apply_import(self, decisions, new_ids):
+        # Runs on the owning thread; new_ids maps the merger's placeholder
+        # keys to store ids for the whole import
+        added = []
+        changes = []
+        for action, key, fields in decisions:
+            if action == 'add':
+                contact = self.contacts.add(fields)
+                new_ids[key] = contact.id
+                added.append(contact)
+                changes.append(('add', {'id': contact.id, 'contact': fields}))
+            elif action == 'merge':
+                contact_id = new_ids.get(key, key)
+                old = self.contacts.get(contact_id)
+                contact = self.contacts.update(contact_id, fields)
+                if old in added:
+                    added[added.index(old)] = contact
+                else:
+                    self.search_index.replace(old, contact)
+                changes.append(('update', {'id': contact_id, 'contact': fields}))
+        self.search_index.add_many(added)
+        self.journal.append_many(changes)
+    
+    def finish_import(self):
+        self.journal.maybe_compact(self.contacts)
+    
+    def import_file(self, path):
+        new_ids = {}
+        rejected = 0
+        merger = None
+        for decisions, batch_rejected, fraction, merger in self.import_batches(path, threading.Event()):
+            self.apply_import(decisions, new_ids)
+            rejected += batch_rejected
+        self.finish_import()
+        return merger, rejected
+    
+    def export_batches(self, path, cancelled):
+        return write_contact_batches(path, self.all_contacts(), cancelled)
+    
+    def export_file(self, path):
+        for _ in self.export_batches(path, threading.Event()):
+            pass
+
+
+BENCH_FIRST = ['Amit', 'Rahul', 'Priya', 'Sneha', 'Ananya', 'Karan', 'Neha', 'Vikram', 'John', 'Maria',
+               'Wei', 'Olga', 'Pedro', 'Fatima', 'Yuki', 'Liam']
+BENCH_LAST = ['Sharma', 'Verma', 'Iyer', 'Patel', 'Khan', 'Gupta', 'Reddy', 'Nair', 'Smith', 'Garcia',
+              'Chen', 'Ivanova', 'Silva', 'Ali', 'Tanaka', 'Murphy']
+BENCH_CITIES = ['Mumbai', 'Delhi', 'Pune', 'Chennai', 'Kolkata', 'Jaipur', 'London', 'Berlin']
+
+
+def generate_contacts(count, seed=0):
+    rng = random.Random(seed)
+    for i in range(count):
+        first = rng.choice(BENCH_FIRST)
+        last = rng.choice(BENCH_LAST)
+        yield {
+            'name': f"{first} {last} {i}",
+            'phone': f"+91 {rng.randrange(10 ** 10):010d}",
+            'email': f"{first.lower()}.{last.lower()}{i}@example.com",
+            'address': f"{rng.randrange(1, 999)} Main Road, {rng.choice(BENCH_CITIES)}",
+            'notes': rng.choice(['', '', '', 'Work', 'Family', 'Gym'])
+        }
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))]
+    return {'p50': pick(0.50), 'p95': pick(0.95), 'p99': pick(0.99), 'max': samples[-1], 'count': len(samples)}
+
+
+def _peak_rss_mb():
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_benchmark(size, workdir, queries=200, edits=500, seed=0):
+    rng = random.Random(seed)
+    result = {'contacts': size}
+    source = os.path.join(workdir, "source.ndjson")
+    with open(source, 'w', encoding='utf-8') as file:
+        for contact in generate_contacts(size, seed):
+            file.write(json.dumps(contact) + "\n")
+    
+    book = ContactBookCore(os.path.join(workdir, "contacts.json"))
+    book.load()
+    start = time.perf_counter()
+    merger, rejected = book.import_file(source)
+    elapsed = time.perf_counter() - start
+    result['import'] = {'seconds': elapsed, 'contacts_per_sec': size / elapsed, 'summary': merger.summary}
+    os.remove(source)
+    
+    ids = list(book.contacts.ids())
+    timings = {'add': [], 'update': [], 'delete': []}
+    for i in range(edits):
+        op = ('add', 'update', 'delete')[i % 3]
+        start = time.perf_counter()
+        if op == 'add':
+            ids.append(book.add(next(generate_contacts(1, seed + i))).id)
+        elif op == 'update':
+            contact_id = rng.choice(ids)
+            book.update(contact_id, dict(book.get(contact_id).to_dict(), notes="edited"))
+        else:
+            book.delete(ids.pop(rng.randrange(len(ids))))
+        timings[op].append((time.perf_counter() - start) * 1000)
+    result['save_ms'] = {op: _percentiles(samples) for op, samples in timings.items()}
+    
+    start = time.perf_counter()
+    book.checkpoint(background=False)
+    result['checkpoint_seconds'] = time.perf_counter() - start
+    book.close()
+    
+    # A cold start in its two steps: replaying the snapshot and journal into
+    # the store, then building the search index over it
+    book = ContactBookCore(os.path.join(workdir, "contacts.json"))
+    start = time.perf_counter()
+    book.contacts = book.journal.load()
+    replayed = time.perf_counter()
+    book.search_index.add_many(list(book.contacts))
+    indexed = time.perf_counter()
+    result['load_seconds'] = {'store': replayed - start, 'index': indexed - replayed, 'total': indexed - start}
+    
+    # Replay typing: every prefix of a name, phone or email fragment
+    contacts = book.all_contacts()
+    keystrokes = []
+    for _ in range(queries):
+        contact = rng.choice(contacts)
+        term = rng.choice([contact.name, contact.phone[-6:], contact.email.split('@')[0], contact.address[-8:]])
+        for end in range(1, len(term) + 1):
+            start = time.perf_counter()
+            book.search(term[:end])
+            keystrokes.append((time.perf_counter() - start) * 1000)
+    result['search_ms'] = _percentiles(keystrokes)
+    book.close()
+    del book, contacts
+    
+    result['peak_rss_mb'] = _peak_rss_mb()
+    result['memory'] = _load_memory(os.path.join(workdir, "contacts.json"))
+    return result
+
+
+def _load_memory(data_file):
+    # Python heap held by the store and by the search index after a cold
+    # start; traced in a second load because tracing slows the timed one
+    import tracemalloc
+    tracemalloc.start()
+    journal = ContactJournal(data_file)
+    contacts = journal.load()
+    journal.close()
+    store = tracemalloc.get_traced_memory()[0]
+    index = ContactSearchIndex()
+    index.add_many(list(contacts))
+    total = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    count = max(len(contacts), 1)
+    return {'store_mb': store / 2 ** 20, 'index_mb': (total - store) / 2 ** 20,
+            'store_bytes_per_contact': store / count, 'index_bytes_per_contact': (total - store) / count}
+
+
+def run_benchmark_suite(sizes, output=None):
+    # Each size runs in its own process so peak RSS is not shared
+    results = {'python': sys.version.split()[0], 'platform': sys.platform, 'runs': []}
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__), '--bench-one', str(size),
+                                   '--workdir', workdir], capture_output=True, text=True)
+        if proc.returncode != 0:
+            results['runs'].append({'contacts': size, 'error': proc.stderr.strip().splitlines()[-1:]})
+        else:
+            results['runs'].append(json.loads(proc.stdout))
+        print(json.dumps(results['runs'][-1]), file=sys.stderr)
+    
+    report = json.dumps(results, indent=2)
+    if output:
+        with open(output, 'w') as file:
+            file.write(report + "\n")
+    else:
+        print(report)
+    return results
+
 
 class AdvancedContactBook:
     def __init__(self, root):
@@ -11,7 +1431,9 @@ class AdvancedContactBook:
         
         # Create data file if not exists
         self.data_file = "contacts.json"
-        self.contacts = self.load_contacts()
+        self.book = ContactBookCore(self.data_file)
+        self.load_job = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Configure styles
         self.style = ttk.Style()
@@ -44,6 +1466,10 @@ class AdvancedContactBook:
         self.search_entry = ttk.Entry(self.search_frame, width=40)
         self.search_entry.pack(side=tk.LEFT, padx=5)
         self.search_entry.bind('<KeyRelease>', self.search_contacts)
+        self.search_status = ttk.Label(self.search_frame, text="")
+        self.search_status.pack(side=tk.RIGHT)
+        self.search_executor = SearchExecutor(self.root, self.book.search, self.show_search_results,
+                                              self.show_search_error)
         
         # Contacts list (Treeview)
         self.contacts_tree = ttk.Treeview(self.contacts_frame, columns=('Name', 'Phone'), selectmode='browse')
@@ -54,11 +1480,13 @@ class AdvancedContactBook:
         self.contacts_tree.column('Name', width=200)
         self.contacts_tree.column('Phone', width=150)
         
-        self.scrollbar = ttk.Scrollbar(self.contacts_frame, orient=tk.VERTICAL, command=self.contacts_tree.yview)
-        self.contacts_tree.configure(yscrollcommand=self.scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(self.contacts_frame, orient=tk.VERTICAL)
         self.contacts_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
         self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.contacts_tree.bind('<<TreeviewSelect>>', self.show_contact_details)
+        self.contact_list = VirtualTreeview(self.contacts_tree, self.scrollbar,
+                                            key_fn=lambda contact: str(contact.id),
+                                            row_fn=lambda contact, pos: (str(contact.id), (contact.name, contact.phone)))
+        self.contacts_tree.bind('<<TreeviewSelect>>', self.show_contact_details, add='+')
         
         # Contact details
         self.detail_labels = {}
@@ -73,52 +1501,85 @@ class AdvancedContactBook:
         self.button_frame = ttk.Frame(self.main_frame)
         self.button_frame.pack(fill=tk.X, pady=10)
         
-        ttk.Button(self.button_frame, text="Add Contact", command=self.add_contact).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.button_frame, text="Edit Contact", command=self.edit_contact).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.button_frame, text="Delete Contact", command=self.delete_contact).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.button_frame, text="Export Contacts", command=self.export_contacts).pack(side=tk.LEFT, padx=5)
-        ttk.Button(self.button_frame, text="Import Contacts", command=self.import_contacts).pack(side=tk.LEFT, padx=5)
+        self.edit_buttons = []
+        for text, command in (("Add Contact", self.add_contact), ("Edit Contact", self.edit_contact),
+                              ("Delete Contact", self.delete_contact), ("Export Contacts", self.export_contacts),
+                              ("Import Contacts", self.import_contacts)):
+            button = ttk.Button(self.button_frame, text=text, command=command)
+            button.pack(side=tk.LEFT, padx=5)
+            self.edit_buttons.append(button)
         
-        # Load contacts
-        self.update_contacts_list()
+        # Load contacts after the window is up
+        self.load_contacts()
     
     def load_contacts(self):
-        if os.path.exists(self.data_file):
-            with open(self.data_file, 'r') as file:
-                return json.load(file)
-        return []
+        # The journal is replayed on a worker thread; contacts show up batch
+        # by batch and editing is enabled once everything is loaded
+        loaded = []
+        
+        def show_batch(batch, fraction):
+            loaded.extend(batch)
+            if not self.search_entry.get().strip():
+                self.contact_list.set_items(loaded)
+            self.search_status.config(text=f"Loading contacts... {fraction:.0%}")
+        
+        def finished(error, cancelled):
+            self.load_job = None
+            if cancelled:
+                return
+            self.search_status.config(text="")
+            if error is not None:
+                messagebox.showerror("Error", f"Failed to load contacts: {str(error)}")
+                return
+            for button in self.edit_buttons:
+                button.state(['!disabled'])
+            self.search_contacts(None)
+        
+        for button in self.edit_buttons:
+            button.state(['disabled'])
+        self.search_status.config(text="Loading contacts...")
+        self.load_job = BatchJob(self.root, self.book.load_batches, on_batch=show_batch, on_done=finished)
     
     def save_contacts(self):
-        with open(self.data_file, 'w') as file:
-            json.dump(self.contacts, file, indent=4)
+        # Full snapshot; day-to-day edits are journaled by the core
+        self.book.checkpoint()
+    
+    def on_close(self):
+        if self.load_job is not None:
+            # Nothing can have been edited yet; the loader thread is a daemon
+            self.load_job.cancel()
+        else:
+            self.book.close()
+        self.root.destroy()
     
     def update_contacts_list(self, contacts=None):
-        self.contacts_tree.delete(*self.contacts_tree.get_children())
-        display_contacts = contacts if contacts else self.contacts
-        
-        for idx, contact in enumerate(display_contacts, 1):
-            self.contacts_tree.insert('', 'end', iid=idx, text=str(idx),
-                                    values=(contact['name'], contact['phone']))
+        display_contacts = contacts if contacts is not None else self.book.all_contacts()
+        self.contact_list.set_items(display_contacts)
     
     def search_contacts(self, event):
-        search_term = self.search_entry.get().lower()
+        search_term = self.search_entry.get().strip()
         if not search_term:
+            self.search_executor.cancel()
+            self.search_status.config(text="")
             self.update_contacts_list()
             return
         
-        filtered = [contact for contact in self.contacts 
-                   if (search_term in contact['name'].lower()) or 
-                   (search_term in contact['phone'])]
-        self.update_contacts_list(filtered)
+        # Refreshes after an edit (no key event) skip the debounce
+        self.search_executor.submit(search_term, delay=0 if event is None else None)
+    
+    def show_search_results(self, search_term, results):
+        self.update_contacts_list(results)
+        latency = self.search_executor.latencies[-1]
+        self.search_status.config(text=f"{len(results)} found in {latency['search_ms']:.1f} ms")
+    
+    def show_search_error(self, search_term, error):
+        self.search_status.config(text=f"Search failed: {error}")
     
     def show_contact_details(self, event):
-        selected = self.contacts_tree.selection()
-        if not selected:
+        contact = self.contact_list.selected
+        if contact is None:
             return
         
-        contact_id = int(selected[0]) - 1
-        contact = self.contacts[contact_id]
-        
         for field in ['name', 'phone', 'email', 'address', 'notes']:
             self.detail_labels[field.capitalize()].config(text=contact.get(field, ''))
     
@@ -126,13 +1587,12 @@ class AdvancedContactBook:
         self.contact_dialog("Add New Contact")
     
     def edit_contact(self):
-        selected = self.contacts_tree.selection()
-        if not selected:
+        contact = self.contact_list.selected
+        if contact is None:
             messagebox.showwarning("Warning", "Please select a contact to edit")
             return
         
-        contact_id = int(selected[0]) - 1
-        self.contact_dialog("Edit Contact", contact_id)
+        self.contact_dialog("Edit Contact", contact.id)
     
     def contact_dialog(self, title, contact_id=None):
         dialog = tk.Toplevel(self.root)
@@ -149,7 +1609,7 @@ class AdvancedContactBook:
             entries[field].grid(row=i, column=1, padx=5, pady=5)
         
         if contact_id is not None:
-            contact = self.contacts[contact_id]
+            contact = self.book.get(contact_id)
             for field in fields:
                 entries[field].insert(0, contact.get(field.lower(), ''))
         
@@ -161,69 +1621,162 @@ class AdvancedContactBook:
                 return
             
             if contact_id is not None:
-                self.contacts[contact_id] = contact_data
+                contact = self.book.update(contact_id, contact_data)
             else:
-                self.contacts.append(contact_data)
+                contact = self.book.add(contact_data)
             
-            self.save_contacts()
-            self.update_contacts_list()
+            self.contact_list.selected = contact
+            self.search_contacts(None)
             dialog.destroy()
         
         ttk.Button(dialog, text="Save", command=save_contact).grid(row=len(fields), column=1, pady=10, sticky=tk.E)
     
     def delete_contact(self):
-        selected = self.contacts_tree.selection()
-        if not selected:
+        contact = self.contact_list.selected
+        if contact is None:
             messagebox.showwarning("Warning", "Please select a contact to delete")
             return
         
         if not messagebox.askyesno("Confirm", "Are you sure you want to delete this contact?"):
             return
         
-        contact_id = int(selected[0]) - 1
-        del self.contacts[contact_id]
-        self.save_contacts()
-        self.update_contacts_list()
+        self.book.delete(contact.id)
+        self.contact_list.selected = None
+        self.search_contacts(None)
         
         # Clear details
         for label in self.detail_labels.values():
             label.config(text="")
     
     def export_contacts(self):
-        file_path = tk.filedialog.asksaveasfilename(
+        file_path = filedialog.asksaveasfilename(
             defaultextension=".json",
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+            filetypes=CONTACT_FILETYPES,
             title="Export contacts to"
         )
         
         if file_path:
-            with open(file_path, 'w') as file:
-                json.dump(self.contacts, file, indent=4)
-            messagebox.showinfo("Success", "Contacts exported successfully")
+            def finished(error, cancelled):
+                dialog.destroy()
+                if error is not None:
+                    messagebox.showerror("Error", f"Failed to export contacts: {str(error)}")
+                elif not cancelled:
+                    messagebox.showinfo("Success", "Contacts exported successfully")
+            
+            dialog, progress = self.transfer_dialog("Exporting contacts")
+            job = BatchJob(self.root, lambda cancelled: self.book.export_batches(file_path, cancelled),
+                           on_batch=lambda batch, rejected, fraction: progress.set(fraction * 100),
+                           on_done=finished)
+            dialog.protocol("WM_DELETE_WINDOW", job.cancel)
+            dialog.cancel_button.config(command=job.cancel)
     
     def import_contacts(self):
-        file_path = tk.filedialog.askopenfilename(
-            filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+        file_path = filedialog.askopenfilename(
+            filetypes=CONTACT_FILETYPES,
             title="Select contacts file to import"
         )
         
         if file_path:
-            try:
-                with open(file_path, 'r') as file:
-                    imported = json.load(file)
-                
-                if not isinstance(imported, list):
-                    messagebox.showerror("Error", "Invalid contacts format")
-                    return
-                
-                self.contacts.extend(imported)
-                self.save_contacts()
-                self.update_contacts_list()
-                messagebox.showinfo("Success", f"Successfully imported {len(imported)} contacts")
-            except Exception as e:
-                messagebox.showerror("Error", f"Failed to import contacts: {str(e)}")
+            status = {'rejected': 0, 'merger': None}
+            new_ids = {}
+            
+            def apply_batch(decisions, rejected, fraction, merger):
+                self.book.apply_import(decisions, new_ids)
+                status['rejected'] += rejected
+                status['merger'] = merger
+                progress.set(fraction * 100)
+            
+            def finished(error, cancelled):
+                dialog.destroy()
+                self.book.finish_import()
+                self.search_contacts(None)
+                summary = self.import_summary(status['merger'], status['rejected'])
+                if error is not None:
+                    messagebox.showerror("Error", f"Failed to import contacts: {str(error)}\n\n{summary}")
+                elif cancelled:
+                    messagebox.showinfo("Cancelled", f"Import cancelled\n\n{summary}")
+                else:
+                    messagebox.showinfo("Success", f"Import finished\n\n{summary}")
+            
+            dialog, progress = self.transfer_dialog("Importing contacts")
+            job = BatchJob(self.root,
+                           lambda cancelled: self.book.import_batches(file_path, cancelled),
+                           on_batch=apply_batch, on_done=finished)
+            dialog.protocol("WM_DELETE_WINDOW", job.cancel)
+            dialog.cancel_button.config(command=job.cancel)
+    
+    def import_summary(self, merger, rejected):
+        counts = merger.summary if merger is not None else {'added': 0, 'merged': 0, 'skipped': 0, 'flagged': 0}
+        lines = [f"Added: {counts['added']}",
+                 f"Merged into existing: {counts['merged']}",
+                 f"Skipped (already present): {counts['skipped']}",
+                 f"Possible duplicates added: {counts['flagged']}"]
+        if rejected:
+            lines.append(f"Invalid records skipped: {rejected}")
+        if merger is not None and merger.flagged:
+            lines.append("")
+            lines.extend(f"  {new} ~ {old}" for new, old in merger.flagged)
+        return "\n".join(lines)
+    
+    def transfer_dialog(self, title):
+        dialog = tk.Toplevel(self.root)
+        dialog.title(title)
+        dialog.transient(self.root)
+        dialog.grab_set()
+        
+        progress = tk.DoubleVar(value=0)
+        ttk.Label(dialog, text=f"{title}...").pack(padx=10, pady=5)
+        ttk.Progressbar(dialog, variable=progress, maximum=100, length=300).pack(padx=10, pady=5)
+        dialog.cancel_button = ttk.Button(dialog, text="Cancel")
+        dialog.cancel_button.pack(pady=5)
+        return dialog, progress
 
-if __name__ == "__main__":
-    root = tk.Tk()
+def startup_probe():
+    # One real start: window constructed, first paint, every contact loaded
+    started = time.perf_counter()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(json.dumps({'error': f"no display: {e}"}))
+        return
     app = AdvancedContactBook(root)
-    root.mainloop()
\ No newline at end of file
+    phases = {'construct_ms': (time.perf_counter() - started) * 1000}
+    root.update()
+    phases['first_paint_ms'] = (time.perf_counter() - started) * 1000
+    while app.load_job is not None:
+        root.update()
+        # Leave the GIL to the loader thread between polls
+        time.sleep(0.005)
+    phases['loaded_ms'] = (time.perf_counter() - started) * 1000
+    phases['contacts'] = len(app.book.contacts)
+    app.on_close()
+    print(json.dumps(phases))
+
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Advanced Contact Book")
+    parser.add_argument('--bench', nargs='?', const='10000,100000,1000000', metavar='SIZES',
+                        help="run the scale benchmark for comma-separated book sizes and print JSON")
+    parser.add_argument('--bench-output', metavar='FILE', help="write benchmark JSON to FILE")
+    parser.add_argument('--bench-one', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--workdir', help=argparse.SUPPRESS)
+    parser.add_argument('--startup-report', action='store_true',
+                        help="time imports, first paint and full load of a fresh start and print JSON")
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.startup_probe:
+        startup_probe()
+    elif args.startup_report:
+        from startup_report import run_startup_report
+        run_startup_report(__file__, output=args.bench_output)
+    elif args.bench_one:
+        print(json.dumps(run_benchmark(args.bench_one, args.workdir)))
+    elif args.bench:
+        run_benchmark_suite([int(size) for size in args.bench.split(',')], args.bench_output)
+    else:
+        root = tk.Tk()
+        app = AdvancedContactBook(root)
+        root.mainloop()
\ No newline at end of file
@@ -1,10 +1,1122 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 import math
-from tkinter import scrolledtext
+import bisect
+import collections
+import csv
+import decimal
+import functools
+import heapq
+import itertools
+import json
+import operator
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from tkinter import filedialog, scrolledtext
+
+# NumPy is only needed by batch GST and costs more to import than the rest
+# of startup together, so _load_numpy() brings it in on first use
+np = None
+_numpy_checked = False
+
+
+def _load_numpy():
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+class ExpressionError(ValueError):
+    pass
+
+
+# Grammar accepted by the calculator (the same text on_button_click builds):
+#   expr    := term (('+' | '-') term)*
+#   term    := unary (('*' | '/' | '//' | '%') unary)*
+#   unary   := ('+' | '-' | '√') unary | power
+#   power   := postfix ('**' unary)?
+#   postfix := primary ('²' | '!')*
+#   primary := NUMBER | '(' expr ')' | FUNCTION '(' expr ')' | CONSTANT
+# NUMBER may carry an exponent ("1e5", "2.5E-3"), as eval accepted and as
+# format_result prints large floats
+TOKEN_RE = re.compile(r"\s*(?:((?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)|(\*\*|//|[-+*/%()²!√])|([A-Za-z_][A-Za-z_0-9]*(?:\.[A-Za-z_][A-Za-z_0-9]*)?))")
+
+BINARY_OPS = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': operator.truediv,
+    '//': operator.floordiv,
+    '%': operator.mod,
+    '**': operator.pow,
+}
+FUNCTIONS = {
+    'math.sqrt': math.sqrt,
+    'sqrt': math.sqrt,
+    'math.factorial': math.factorial,
+    'factorial': math.factorial,
+    'int': int,
+    'abs': abs,
+}
+CONSTANTS = {
+    'math.pi': math.pi,
+    'pi': math.pi,
+    'math.e': math.e,
+}
+
+
+def tokenize(text, pos=0):
+    # Tokens are (kind, value, start, end); start/end let callers re-scan
+    # only the edited tail of a longer expression
+    tokens = []
+    text = text.rstrip()
+    while pos < len(text):
+        match = TOKEN_RE.match(text, pos)
+        if not match:
+            raise ExpressionError(f"Unexpected character {text[pos].strip() or text[pos]!r} at position {pos + 1}")
+        number, symbol, name = match.groups()
+        if number is not None:
+            kind, value = 'num', number
+        elif symbol is not None:
+            kind, value = 'op', symbol
+        elif name in FUNCTIONS:
+            kind, value = 'func', name
+        elif name in CONSTANTS:
+            kind, value = 'const', name
+        else:
+            raise ExpressionError(f"Unknown name {name!r}")
+        tokens.append((kind, value, match.start(), match.end()))
+        pos = match.end()
+    return tokens
+
+
+class ExpressionParser:
+    # Recursive-descent parser producing a small tuple AST
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.pos = 0
+    
+    def parse(self):
+        if not self.tokens:
+            raise ExpressionError("Empty expression")
+        node = self.expr()
+        if self.pos != len(self.tokens):
+            raise ExpressionError(f"Unexpected {self.tokens[self.pos][1]!r}")
+        return node
+    
+    def peek(self):
+        return self.tokens[self.pos][1] if self.pos < len(self.tokens) else None
+    
+    def take(self, expected=None):
+        if self.pos >= len(self.tokens):
+            raise ExpressionError("Incomplete expression")
+        kind, value = self.tokens[self.pos][:2]
+        if expected is not None and value != expected:
+            raise ExpressionError(f"Expected {expected!r} but found {value!r}")
+        self.pos += 1
+        return kind, value
+    
+    def expr(self):
+        node = self.term()
+        while self.peek() in ('+', '-'):
+            node = ('bin', self.take()[1], node, self.term())
+        return node
+    
+    def term(self):
+        node = self.unary()
+        while self.peek() in ('*', '/', '//', '%'):
+            node = ('bin', self.take()[1], node, self.unary())
+        return node
+    
+    def unary(self):
+        if self.peek() in ('+', '-', '√'):
+            op = self.take()[1]
+            return ('unary', op, self.unary())
+        return self.power()
+    
+    def power(self):
+        node = self.postfix()
+        if self.peek() == '**':
+            self.take()
+            node = ('bin', '**', node, self.unary())
+        return node
+    
+    def postfix(self):
+        node = self.primary()
+        while self.peek() in ('²', '!'):
+            node = ('postfix', self.take()[1], node)
+        return node
+    
+    def primary(self):
+        kind, value = self.take()
+        if kind in ('num', 'const'):
+            # Literals stay as text; the numeric backend converts them
+            return (kind, value)
+        if kind == 'func':
+            self.take('(')
+            node = ('call', value, self.expr())
+            self.take(')')
+            return node
+        if value == '(':
+            node = self.expr()
+            self.take(')')
+            return node
+        raise ExpressionError(f"Unexpected {value!r}")
+
+
+FACTORIAL_TABLE_SIZE = 1024
+_factorials = [1]
+LOG10_2 = math.log10(2)
+MAX_RESULT_DIGITS = 100
+
+
+def factorial(n):
+    # Small n (what the preview hits while typing) comes from a memo table;
+    # beyond it math.factorial already uses binary splitting in C
+    if isinstance(n, int) and 0 <= n < FACTORIAL_TABLE_SIZE:
+        table = _factorials
+        while len(table) <= n:
+            table.append(table[-1] * len(table))
+        return table[n]
+    return math.factorial(n)
+
+
+def power(base, exponent):
+    # Powers of two are a shift, which is linear instead of repeated squaring
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0 and base \
+            and abs(base) & (abs(base) - 1) == 0:
+        value = 1 << (abs(base).bit_length() - 1) * exponent
+        return -value if base < 0 and exponent % 2 else value
+    return base ** exponent
+
+
+def digit_count(n):
+    n = abs(n)
+    if n < 10:
+        return 1
+    if n.bit_length() < 1000:
+        return len(str(n))
+    log = math.log10(n)
+    digits = int(log) + 1
+    # log10 is only a float: check exactly when n sits close to a power of ten
+    if log - int(log) < 1e-9 and n < 10 ** (digits - 1):
+        digits -= 1
+    elif log - int(log) > 1 - 1e-9 and n >= 10 ** digits:
+        digits += 1
+    return digits
+
+
+def format_result(value, max_digits=MAX_RESULT_DIGITS):
+    # Huge integers are shown as mantissa/exponent from log10 and bit_length,
+    # so rendering never has to build the full decimal string
+    if not isinstance(value, int) or value.bit_length() <= max_digits * 3:
+        return str(value)
+    digits = digit_count(value)
+    if digits <= max_digits:
+        return str(value)
+    exponent = digits - 1
+    mantissa = 10 ** min(max(math.log10(abs(value)) - exponent, 0.0), 1.0)
+    sign = '-' if value < 0 else ''
+    return f"{sign}{min(mantissa, 9.999999999):.9f}e+{exponent} ({digits:,} digits)"
+
+
+def decimal_divmod(a, b):
+    # Decimal // and % truncate toward zero where int and float floor;
+    # corrected here so exact mode gives float mode's answers
+    quotient, remainder = divmod(a, b)
+    if remainder and (remainder < 0) != (b < 0):
+        quotient -= 1
+        remainder += b
+    # No "-0" where int arithmetic has a plain 0
+    return quotient if quotient else abs(quotient), remainder if remainder else abs(remainder)
+
+
+DECIMAL_OPS = dict(BINARY_OPS, **{
+    '//': lambda a, b: decimal_divmod(a, b)[0],
+    '%': lambda a, b: decimal_divmod(a, b)[1],
+})
+
+
+class NumericBackend:
+    # Python int/float arithmetic with the kernels above
+    name = 'float'
+    ops = BINARY_OPS
+    
+    def number(self, text):
+        return int(text) if text.isdigit() else float(text)
+    
+    def constant(self, name):
+        return CONSTANTS[name]
+    
+    def sqrt(self, value):
+        return math.sqrt(value)
+    
+    def factorial(self, value):
+        return factorial(value)
+    
+    def run(self, compiled):
+        return compiled()
+
+
+class DecimalBackend(NumericBackend):
+    # Exact decimal literals and arithmetic at a fixed number of significant
+    # digits; pi and e only carry float precision
+    name = 'decimal'
+    ops = DECIMAL_OPS
+    
+    def __init__(self, precision=28):
+        self.precision = precision
+        self.context = decimal.Context(prec=precision)
+    
+    def __eq__(self, other):
+        return isinstance(other, DecimalBackend) and other.precision == self.precision
+    
+    def __hash__(self):
+        return hash(('decimal', self.precision))
+    
+    def number(self, text):
+        return Decimal(text)
+    
+    def constant(self, name):
+        return Decimal(repr(CONSTANTS[name]))
+    
+    def sqrt(self, value):
+        return self.context.sqrt(Decimal(value))
+    
+    def factorial(self, value):
+        return Decimal(factorial(int(value)))
+    
+    def run(self, compiled):
+        with decimal.localcontext(self.context):
+            return compiled()
+
+
+FLOAT_BACKEND = NumericBackend()
+
+
+class PreviewSkipped(Exception):
+    pass
+
+
+def preview_guard(op, *operands):
+    # Live preview refuses work that could stall the UI; '=' still computes it
+    if op == '!' and operands[0] > 2000:
+        raise PreviewSkipped()
+    if op == '**':
+        base, exponent = operands
+        if isinstance(base, int) and isinstance(exponent, int) and abs(base) > 1 \
+                and exponent > 5000 / math.log10(abs(base)):
+            raise PreviewSkipped()
+    return operands
+
+
+def _compile_node(node, guard=None, backend=FLOAT_BACKEND):
+    # Turn the AST into nested closures so evaluation is just function calls.
+    # guard, if given, sees the operands of '**', '²' (as '**' 2) and '!'
+    # before they run.
+    kind = node[0]
+    if kind in ('num', 'const'):
+        value = backend.number(node[1]) if kind == 'num' else backend.constant(node[1])
+        return lambda: value
+    if kind == 'bin':
+        op = power if node[1] == '**' else backend.ops[node[1]]
+        left = _compile_node(node[2], guard, backend)
+        right = _compile_node(node[3], guard, backend)
+        if guard is not None and node[1] == '**':
+            return lambda: op(*guard('**', left(), right()))
+        return lambda: op(left(), right())
+    if kind == 'unary':
+        operand = _compile_node(node[2], guard, backend)
+        if node[1] == '-':
+            return lambda: -operand()
+        if node[1] == '√':
+            return lambda: backend.sqrt(operand())
+        return operand
+    if kind == 'postfix':
+        operand = _compile_node(node[2], guard, backend)
+        if node[1] == '²':
+            if guard is not None:
+                return lambda: operator.pow(*guard('**', operand(), 2))
+            return lambda: operand() ** 2
+        if guard is not None:
+            return lambda: backend.factorial(*guard('!', int(operand())))
+        return lambda: backend.factorial(int(operand()))
+    if kind == 'call':
+        func = FUNCTIONS[node[1]]
+        if func is math.factorial:
+            func = backend.factorial
+        elif func is math.sqrt:
+            func = backend.sqrt
+        operand = _compile_node(node[2], guard, backend)
+        if guard is not None and func == backend.factorial:
+            return lambda: func(*guard('!', operand()))
+        return lambda: func(operand())
+    raise ExpressionError(f"Unknown node {kind!r}")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_expression(text, guard=None, backend=FLOAT_BACKEND):
+    return _compile_node(ExpressionParser(tokenize(text)).parse(), guard, backend)
+
+
+def evaluate(text, guard=None, backend=FLOAT_BACKEND):
+    return backend.run(compile_expression(text.strip(), guard, backend))
+
+
+class LiveEvaluator:
+    # Re-evaluates the entry on every edit without redoing the whole string.
+    # Tokens before the first changed character are kept, and the running
+    # value of the top-level + / - chain is checkpointed after each operator,
+    # so appending or deleting at the end only re-parses the last term.
+    def __init__(self, guard=preview_guard, backend=FLOAT_BACKEND):
+        self.guard = guard
+        self.backend = backend
+        self.text = ''
+        self.tokens = []
+        self.checkpoints = []
+    
+    def reset(self):
+        self.text = ''
+        self.tokens = []
+        self.checkpoints = []
+    
+    def update(self, text):
+        if text.startswith(self.text):
+            same = len(self.text)
+        elif self.text.startswith(text):
+            same = len(text)
+        else:
+            same = 0
+            limit = min(len(text), len(self.text))
+            while same < limit and text[same] == self.text[same]:
+                same += 1
+        
+        # A token touching the edit may grow ("12" -> "123", "*" -> "**")
+        kept = bisect.bisect_left(self.tokens, same, key=operator.itemgetter(3))
+        try:
+            tail = tokenize(text, self.tokens[kept - 1][3] if kept else 0)
+        except ExpressionError:
+            self.reset()
+            raise
+        self.tokens = self.tokens[:kept] + tail
+        self.text = text
+        while self.checkpoints and self.checkpoints[-1][0] > kept:
+            self.checkpoints.pop()
+        
+        parser = ExpressionParser(self.tokens)
+        if not self.tokens:
+            raise ExpressionError("Empty expression")
+        if self.checkpoints:
+            parser.pos, value, op = self.checkpoints[-1]
+        else:
+            value, op = None, None
+        while True:
+            term = self.backend.run(_compile_node(parser.term(), self.guard, self.backend))
+            value = term if op is None else self.backend.run(functools.partial(self.backend.ops[op], value, term))
+            if parser.peek() not in ('+', '-'):
+                break
+            op = parser.take()[1]
+            self.checkpoints.append((parser.pos, value, op))
+        if parser.pos != len(self.tokens):
+            raise ExpressionError(f"Unexpected {self.tokens[parser.pos][1]!r}")
+        return value
+
+
+def _evaluation_worker(conn, memory_limit):
+    if resource is not None and memory_limit:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    while True:
+        message = conn.recv()
+        if message is None:
+            break
+        job, text, backend = message
+        try:
+            conn.send((job, True, format_result(evaluate(text, backend=backend))))
+        except MemoryError:
+            conn.send((job, False, f"Out of memory (limit {memory_limit // 2**20} MB)"))
+        except Exception as e:
+            conn.send((job, False, str(e) or type(e).__name__))
+
+
+class EvaluationWorker:
+    # Runs expressions that are too heavy for the Tk thread in a separate
+    # process. A process (not a thread) is used so a runaway factorial or
+    # power can be killed on timeout or cancel; a fresh one is started after.
+    def __init__(self, time_limit=5.0, memory_limit_mb=512):
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit_mb * 2**20 if memory_limit_mb else 0
+        self.context = None
+        self.process = None
+        self.conn = None
+        self.job = 0
+        self.started = None
+    
+    @property
+    def busy(self):
+        return self.started is not None
+    
+    def start(self):
+        if self.process is not None and self.process.is_alive():
+            return
+        if self.context is None:
+            # Imported here, off the startup path
+            import multiprocessing
+            self.context = multiprocessing.get_context('spawn')
+        self.conn, child = self.context.Pipe()
+        self.process = self.context.Process(target=_evaluation_worker,
+                                            args=(child, self.memory_limit), daemon=True)
+        self.process.start()
+        child.close()
+    
+    def stop(self):
+        if self.process is None:
+            return
+        if self.process.is_alive():
+            self.process.terminate()
+        self.process.join(1)
+        self.conn.close()
+        self.process = None
+        self.conn = None
+        self.started = None
+    
+    def submit(self, text, backend=FLOAT_BACKEND):
+        self.start()
+        self.job += 1
+        self.conn.send((self.job, text, backend))
+        self.started = time.monotonic()
+        return self.job
+    
+    def cancel(self):
+        # The only way to interrupt a C-level factorial is to kill the process
+        if self.busy:
+            self.stop()
+            self.start()
+    
+    def poll(self):
+        # None while running, else (ok, text) for the last submitted job
+        if not self.busy:
+            return None
+        try:
+            while self.conn.poll():
+                job, ok, text = self.conn.recv()
+                if job == self.job:
+                    self.started = None
+                    return ok, text
+        except (EOFError, OSError):
+            self.stop()
+            return False, "Evaluation process exited unexpectedly"
+        if self.time_limit and time.monotonic() - self.started > self.time_limit:
+            self.cancel()
+            return False, f"Timed out after {self.time_limit:g}s"
+        return None
+    
+    def close(self):
+        if self.process is not None and self.process.is_alive() and not self.busy:
+            try:
+                self.conn.send(None)
+            except OSError:
+                pass
+        self.stop()
+
+
+GST_SLABS = {
+    "Exempt (0%)": 0,
+    "5%": 5,
+    "12%": 12,
+    "18%": 18,
+    "28%": 28
+}
+PAISE = Decimal('0.01')
+# Amounts longer than this are bad rows rather than thousand-digit invoices
+GST_MAX_DIGITS = 1000
+
+
+def parse_gst_rate(value, default_rate):
+    # Accepts a slab label ("18%"), a bare rate ("18") or blank for the default
+    value = (value or '').strip()
+    if not value:
+        return default_rate
+    if value in GST_SLABS:
+        return GST_SLABS[value]
+    try:
+        rate = float(value.rstrip('%'))
+    except ValueError:
+        raise ValueError(f"Unknown GST slab {value!r}")
+    if rate not in GST_SLABS.values():
+        raise ValueError(f"Unknown GST slab {value!r}")
+    return int(rate)
+
+
+def _gst_columns(header):
+    # Returns (amount column, slab column or None); headerless files use 0/1
+    names = [name.strip().lower() for name in header]
+    if 'amount' in names:
+        slab = next((names.index(name) for name in ('slab', 'rate', 'gst') if name in names), None)
+        return names.index('amount'), slab, True
+    return 0, 1 if len(names) > 1 else None, False
+
+
+def gst_exact(value, rate, mode='add'):
+    # (base, gst, total) in paise, rounded half-up like an invoice. Rounding
+    # to the paisa needs every digit of the amount (and of amount * rate), so
+    # the current context's precision is raised to cover them
+    digits = max(len(value.as_tuple().digits), value.adjusted() + 1)
+    if digits > GST_MAX_DIGITS:
+        raise InvalidOperation(f"amount has more than {GST_MAX_DIGITS} digits")
+    rate = Decimal(rate)
+    with decimal.localcontext() as context:
+        context.prec = max(context.prec, digits + 4)
+        if mode == 'remove':
+            base = (value * 100 / (100 + rate)).quantize(PAISE, ROUND_HALF_UP)
+            total = value.quantize(PAISE, ROUND_HALF_UP)
+            gst = total - base
+        else:
+            base = value.quantize(PAISE, ROUND_HALF_UP)
+            gst = (value * rate / 100).quantize(PAISE, ROUND_HALF_UP)
+            total = base + gst
+    return base, gst, total
+
+
+def _gst_chunk_exact(amounts, rates, mode):
+    # All three engines treat inf, nan and overflowing amounts as bad rows
+    results = []
+    for amount, rate in zip(amounts, rates):
+        try:
+            value = Decimal(amount.strip().replace(',', ''))
+            if not value.is_finite():
+                raise InvalidOperation(amount)
+            results.append(tuple(map(str, gst_exact(value, rate, mode))))
+        except ArithmeticError:
+            results.append(None)
+    return results
+
+
+def _gst_chunk_vectorized(amounts, rates, mode):
+    try:
+        values = np.asarray(amounts, dtype=np.float64)
+    except ValueError:
+        # Fall back to per-row parsing only for chunks with bad cells
+        parsed = []
+        for amount in amounts:
+            try:
+                parsed.append(float(amount.replace(',', '')))
+            except ValueError:
+                parsed.append(np.nan)
+        values = np.asarray(parsed, dtype=np.float64)
+    rates = np.asarray(rates, dtype=np.float64)
+    if mode == 'remove':
+        base = values / (1 + rates / 100)
+        gst = values - base
+        total = values
+    else:
+        base = values
+        gst = values * rates / 100
+        total = values + gst
+    # Round in bulk, then a plain format per cell beats np.char.mod
+    columns = [list(map('{:.2f}'.format, np.round(column, 2).tolist())) for column in (base, gst, total)]
+    results = list(zip(*columns))
+    # Unparseable cells are NaN here; inf, nan and overflow are rejected too
+    for index in np.flatnonzero(~(np.isfinite(values) & np.isfinite(gst) & np.isfinite(total))):
+        results[index] = None
+    return results
+
+
+def _gst_chunk_float(amounts, rates, mode):
+    results = []
+    for amount, rate in zip(amounts, rates):
+        try:
+            value = float(amount.replace(',', ''))
+        except ValueError:
+            results.append(None)
+            continue
+        if mode == 'remove':
+            base = value / (1 + rate / 100)
+            gst, total = value - base, value
+        else:
+            base, gst, total = value, value * rate / 100, value + value * rate / 100
+        if not (math.isfinite(value) and math.isfinite(gst) and math.isfinite(total)):
+            results.append(None)
+            continue
+        results.append((f"{base:.2f}", f"{gst:.2f}", f"{total:.2f}"))
+    return results
+
+
+def run_gst_batch(input_path, output_path, slab="18%", mode='add', exact=False, chunk_size=50000,
+                  progress=None, cancelled=None):
+    # Streams a CSV of amounts (and optional per-row slab) through GST in
+    # fixed-size chunks; memory stays flat however long the file is.
+    # exact=True uses Decimal with half-up rounding to the paisa, otherwise
+    # NumPy vectorizes each chunk when it is installed.
+    default_rate = parse_gst_rate(slab, GST_SLABS["18%"])
+    _load_numpy()
+    if exact:
+        compute, engine = _gst_chunk_exact, 'decimal'
+    elif np is not None:
+        compute, engine = _gst_chunk_vectorized, 'numpy'
+    else:
+        compute, engine = _gst_chunk_float, 'float'
+    
+    started = time.perf_counter()
+    rows = errors = 0
+    rate_cache = {}
+    with open(input_path, 'r', newline='', encoding='utf-8-sig') as src, \
+            open(output_path, 'w', newline='', encoding='utf-8') as dst:
+        reader = csv.reader(src)
+        writer = csv.writer(dst)
+        first = next(reader, None)
+        if first is None:
+            return _gst_batch_stats(0, 0, started, engine)
+        amount_col, slab_col, has_header = _gst_columns(first)
+        if has_header:
+            width = len(first)
+            pending = reader
+        else:
+            # Every row is padded to the widest one so the added columns line
+            # up; with no header to go by that takes one extra read of the file
+            width = max(itertools.chain([len(first)], map(len, reader)))
+            slab_col = 1 if width > 1 else None
+            src.seek(0)
+            pending = csv.reader(src)
+        writer.writerow((first if has_header else [f"column{i + 1}" for i in range(width)])
+                        + ['base', 'gst', 'total', 'error'])
+        
+        while True:
+            if cancelled is not None and cancelled():
+                break
+            chunk = list(itertools.islice(pending, chunk_size))
+            if not chunk:
+                break
+            amounts = [row[amount_col] if amount_col < len(row) else '' for row in chunk]
+            rates = []
+            row_errors = {}
+            for index, row in enumerate(chunk):
+                if len(row) > width:
+                    row_errors[index] = "More columns than the header"
+                    del row[width:]
+                elif len(row) < width:
+                    row.extend([''] * (width - len(row)))
+                label = row[slab_col] if slab_col is not None and slab_col < len(row) else ''
+                rate = rate_cache.get(label)
+                if rate is None:
+                    try:
+                        rate = rate_cache[label] = parse_gst_rate(label, default_rate)
+                    except ValueError as e:
+                        rate = 0
+                        row_errors[index] = str(e)
+                rates.append(rate)
+            
+            results = compute(amounts, rates, mode)
+            for index in row_errors:
+                results[index] = None
+            for row, result in zip(chunk, results):
+                if result is None:
+                    row.extend(('', '', ''))
+                else:
+                    row.extend(result)
+                row.append('')
+            for index, result in enumerate(results):
+                if result is None:
+                    errors += 1
+                    chunk[index][-1] = row_errors.get(index, "Invalid amount")
+            writer.writerows(chunk)
+            rows += len(chunk)
+            if progress is not None:
+                progress(rows)
+    
+    return _gst_batch_stats(rows, errors, started, engine)
+
+
+def _gst_batch_stats(rows, errors, started, engine):
+    seconds = time.perf_counter() - started
+    return {'rows': rows, 'errors': errors, 'seconds': seconds,
+            'rows_per_sec': rows / seconds if seconds else 0.0, 'engine': engine}
+
+
+HISTORY_FILE = "calculator_history.jsonl"
+HISTORY_TOKEN_RE = re.compile(r"\d+(?:\.\d+)?|[^\W\d]+|[^\w\s]")
+
+
+def _history_tokens(text):
+    return set(HISTORY_TOKEN_RE.findall(text.lower()))
+
+
+class CalculationHistory:
+    # Every entry is appended to an NDJSON log; only the newest `capacity`
+    # stay in memory for the widget. An inverted index of tokens -> log
+    # offsets finds older entries, which are read back from disk on demand.
+    def __init__(self, path=HISTORY_FILE, capacity=200):
+        self.path = path
+        self.recent = collections.deque(maxlen=capacity)
+        self.offsets = []
+        self.index = collections.defaultdict(list)
+        self.terms = []
+        self.file = None
+        self.skipped = 0
+    
+    def load(self):
+        for _ in self.load_steps():
+            pass
+    
+    def load_steps(self, chunk=20000):
+        # load() in slices for the GUI: yields the number of entries read so
+        # far every `chunk` lines; the log is open for appends once exhausted
+        self.recent.clear()
+        self.offsets = []
+        self.index.clear()
+        self.skipped = 0
+        if os.path.exists(self.path):
+            good_end = end = 0
+            bad = 0
+            with open(self.path, 'rb') as file:
+                for line in file:
+                    offset = end
+                    end += len(line)
+                    try:
+                        if not line.endswith(b"\n"):
+                            raise ValueError("incomplete record")
+                        record = json.loads(line)
+                        if not isinstance(record, dict) or not isinstance(record.get('text'), str):
+                            raise ValueError("not a history entry")
+                    except ValueError:
+                        # Skipped if valid entries follow it; if not, it is a
+                        # torn tail from a crash mid-write and is cut off below
+                        bad += 1
+                        continue
+                    self.skipped += bad
+                    bad = 0
+                    good_end = end
+                    self._index(record, offset, keep_sorted=False)
+                    if len(self.offsets) % chunk == 0:
+                        yield len(self.offsets)
+            if self.skipped:
+                print(f"{self.path}: skipped {self.skipped} unreadable entries", file=sys.stderr)
+            if good_end < os.path.getsize(self.path):
+                with open(self.path, 'r+b') as file:
+                    file.truncate(good_end)
+        self.terms = sorted(self.index)
+        self.file = open(self.path, 'ab')
+    
+    def _index(self, record, offset, keep_sorted=True):
+        entry_id = len(self.offsets)
+        self.offsets.append(offset)
+        self.recent.append(record)
+        for token in _history_tokens(record['text']):
+            postings = self.index[token]
+            if not postings and keep_sorted:
+                bisect.insort(self.terms, token)
+            postings.append(entry_id)
+    
+    def add(self, text, expression=None):
+        if self.file is None:
+            raise OSError("history log is not open")
+        record = {'time': time.time(), 'text': text, 'expression': expression}
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8')
+        offset = self.file.tell()
+        self.file.write(line)
+        self.file.flush()
+        self._index(record, offset)
+        return record
+    
+    def _matching(self, token):
+        # Ids of entries with a token starting with `token`
+        start = bisect.bisect_left(self.terms, token)
+        matches = set()
+        for term in itertools.islice(self.terms, start, None):
+            if not term.startswith(token):
+                break
+            matches.update(self.index[term])
+        return matches
+    
+    def search(self, query, limit=50):
+        tokens = sorted(_history_tokens(query), key=len, reverse=True)
+        if not tokens:
+            return list(self.recent)[-limit:]
+        ids = None
+        for token in tokens:
+            ids = self._matching(token) if ids is None else ids & self._matching(token)
+            if not ids:
+                return []
+        found = heapq.nlargest(limit, ids)
+        records = []
+        with open(self.path, 'rb') as file:
+            for entry_id in sorted(found):
+                file.seek(self.offsets[entry_id])
+                records.append(json.loads(file.readline()))
+        return records
+    
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+KEYS_MAPPING = {
+    '\r': '=',
+    '\x08': '⌫',
+    '\x1b': 'C'
+}
+KEYSYM_MAPPING = {
+    'Escape': 'C',
+    'BackSpace': '⌫',
+    'Return': '=',
+}
+
+
+def key_to_button(char, keysym):
+    # Which calculator button a key press stands for, or None
+    if char in KEYS_MAPPING:
+        return KEYS_MAPPING[char]
+    if char and char in '0123456789+-*/.()%':
+        return char
+    return KEYSYM_MAPPING.get(keysym)
+
+
+def apply_button(current, button_text):
+    # Entry text after pressing a button other than 'C' and '='
+    if button_text == '⌫':
+        return current[:-1]
+    if button_text == '√':
+        return f"math.sqrt({current})"
+    if button_text == 'x²':
+        return f"({current})**2"
+    if button_text == 'x!':
+        return f"math.factorial(int({current}))"
+    return current + button_text
+
+
+def generate_expressions(count, seed=0, repeat=0.3):
+    # Calculator-style input; `repeat` of them reuse one of the last 50,
+    # which is what the compile cache sees when people re-run calculations
+    rng = random.Random(seed)
+    
+    def operand(depth):
+        roll = rng.random()
+        if depth < 2 and roll < 0.2:
+            return f"({expression(depth + 1)})"
+        if roll < 0.25:
+            return f"math.sqrt({rng.randint(0, 10000)})"
+        if roll < 0.3:
+            return f"{rng.randint(0, 20)}!"
+        if roll < 0.35:
+            return f"{rng.randint(0, 999)}²"
+        if roll < 0.55:
+            return f"{rng.uniform(0, 10000):.2f}"
+        return str(rng.randint(1, 100000))
+    
+    def expression(depth=0):
+        parts = [operand(depth)]
+        for _ in range(rng.randint(1, 5)):
+            parts.append(rng.choice(['+', '-', '*', '/', '//', '%', '+', '*']))
+            parts.append(operand(depth))
+        if rng.random() < 0.05:
+            parts.append(f"**{rng.randint(0, 3)}")
+        return ''.join(parts)
+    
+    expressions = []
+    for _ in range(count):
+        if expressions and rng.random() < repeat:
+            expressions.append(rng.choice(expressions[-50:]))
+        else:
+            expressions.append(expression())
+    return expressions
+
+
+def _percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(len(samples) * q))]
+    return {'p50': pick(0.50), 'p99': pick(0.99), 'max': samples[-1], 'count': len(samples)}
+
+
+def _timed(items, step):
+    # Per-item latency in microseconds plus throughput and error count
+    latencies = []
+    errors = 0
+    clock = time.perf_counter
+    started = clock()
+    for item in items:
+        before = clock()
+        try:
+            step(item)
+        except Exception:
+            errors += 1
+        latencies.append((clock() - before) * 1e6)
+    seconds = clock() - started
+    result = {'ops': len(latencies), 'errors': errors, 'seconds': round(seconds, 4),
+              'ops_per_sec': round(len(latencies) / seconds if seconds else 0.0, 1)}
+    result['latency_us'] = {key: round(value, 2) for key, value in _percentiles(latencies).items()}
+    return result
+
+
+def _allocations(run):
+    # Second pass under tracemalloc: timings above stay free of its overhead
+    import tracemalloc
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    run()
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    stats = after.compare_to(before, 'filename')
+    return {'new_blocks': sum(stat.count_diff for stat in stats if stat.count_diff > 0),
+            'net_kib': round(sum(stat.size_diff for stat in stats) / 1024, 1),
+            'peak_kib': round(peak / 1024, 1)}
+
+
+def _cache_stats(before, after):
+    hits = after.hits - before.hits
+    misses = after.misses - before.misses
+    return {'hits': hits, 'misses': misses, 'hit_rate': round(hits / (hits + misses), 4) if hits + misses else None}
+
+
+def bench_evaluate(expressions, backend=FLOAT_BACKEND):
+    # What '=' does: inline guarded evaluation, then result formatting
+    def step(expression):
+        format_result(evaluate(expression, guard=preview_guard, backend=backend))
+    
+    compile_expression.cache_clear()
+    before = compile_expression.cache_info()
+    result = _timed(expressions, step)
+    result['compile_cache'] = _cache_stats(before, compile_expression.cache_info())
+    compile_expression.cache_clear()
+    result['allocations'] = _allocations(lambda: [_timed(expressions, step)])
+    return result
+
+
+def bench_keystrokes(expressions, backend=FLOAT_BACKEND, backspace=0.1, seed=0):
+    # Types each expression key by key through key_to_button/apply_button and
+    # refreshes the live preview after every key, as the GUI does
+    rng = random.Random(seed)
+    keys = []
+    for expression in expressions:
+        keys.append(('\x1b', 'Escape'))
+        for char in expression:
+            keys.append((char, char))
+            if rng.random() < backspace:
+                keys.append(('\x08', 'BackSpace'))
+                keys.append((char, char))
+    
+    def run():
+        state = {'text': '', 'live': LiveEvaluator(backend=backend)}
+        
+        def step(key):
+            button = key_to_button(*key)
+            if button is None:
+                # Characters without a key binding ('!', '²', 'math.sqrt') come from buttons
+                state['text'] += key[0]
+            elif button == 'C':
+                state['text'] = ''
+                state['live'].reset()
+                return
+            elif button != '=':
+                state['text'] = apply_button(state['text'], button)
+            if state['text']:
+                try:
+                    state['live'].update(state['text'])
+                except (ArithmeticError, ValueError, PreviewSkipped):
+                    pass
+        
+        return _timed(keys, step)
+    
+    result = run()
+    result['allocations'] = _allocations(run)
+    return result
+
+
+def bench_gst(count, seed=0, exact=False):
+    # The single-amount path behind the Add/Remove/Calculate GST buttons
+    rng = random.Random(seed)
+    rates = list(GST_SLABS.values())
+    items = [(f"{rng.uniform(1, 1000000):.2f}", rng.choice(rates), rng.choice(('add', 'remove')))
+             for _ in range(count)]
+    
+    if exact:
+        def step(item):
+            gst_exact(Decimal(item[0]), item[1], item[2])
+    else:
+        def step(item):
+            amount, rate, mode = float(item[0]), item[1], item[2]
+            if mode == 'remove':
+                base = amount / (1 + rate / 100)
+                f"{base:.2f} {amount - base:.2f}"
+            else:
+                f"{amount * rate / 100:.2f} {amount + amount * rate / 100:.2f}"
+    
+    result = _timed(items, step)
+    result['allocations'] = _allocations(lambda: _timed(items, step))
+    return result
+
+
+def bench_gst_batch(rows, workdir, seed=0, exact=False):
+    rng = random.Random(seed)
+    source = os.path.join(workdir, "amounts.csv")
+    with open(source, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        writer.writerow(['amount', 'slab'])
+        for _ in range(rows):
+            writer.writerow([f"{rng.uniform(1, 1000000):.2f}", rng.choice(list(GST_SLABS))])
+    output = os.path.join(workdir, "gst.csv")
+    stats = run_gst_batch(source, output, exact=exact)
+    result = {key: round(value, 4) if isinstance(value, float) else value for key, value in stats.items()}
+    result['allocations'] = _allocations(lambda: run_gst_batch(source, output, exact=exact))
+    return result
+
+
+def run_benchmark(count=20000, seed=0, profile_dir=None, output=None):
+    expressions = generate_expressions(count, seed)
+    exact = DecimalBackend(28)
+    with tempfile.TemporaryDirectory() as workdir:
+        scenarios = [
+            ('evaluate', lambda: bench_evaluate(expressions)),
+            ('evaluate_decimal', lambda: bench_evaluate(expressions, exact)),
+            ('keystrokes', lambda: bench_keystrokes(expressions[:max(1, count // 10)], seed=seed)),
+            ('gst', lambda: bench_gst(count, seed)),
+            ('gst_exact', lambda: bench_gst(count, seed, exact=True)),
+            ('gst_batch', lambda: bench_gst_batch(count * 5, workdir, seed)),
+            ('gst_batch_exact', lambda: bench_gst_batch(count * 5, workdir, seed, exact=True)),
+        ]
+        results = {'python': sys.version.split()[0], 'platform': sys.platform,
+                   'numpy': np.__version__ if _load_numpy() is not None else None,
+                   'expressions': count, 'seed': seed, 'scenarios': {}}
+        for name, scenario in scenarios:
+            if profile_dir:
+                import cProfile
+                os.makedirs(profile_dir, exist_ok=True)
+                profiler = cProfile.Profile()
+                result = profiler.runcall(scenario)
+                profiler.dump_stats(os.path.join(profile_dir, f"{name}.prof"))
+            else:
+                result = scenario()
+            results['scenarios'][name] = result
+            print(f"{name}: {json.dumps(result)}", file=sys.stderr)
+    
+    text = json.dumps(results, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return results
+
 
 class AdvancedCalculatorGUI:
-    def __init__(self, root):
+    def __init__(self, root, time_limit=5.0, memory_limit_mb=512,
+                 history_file=HISTORY_FILE, history_size=200):
         self.root = root
         self.root.title("Advanced Calculator with GST")
         self.root.geometry("450x700")
@@ -13,13 +1125,16 @@ class AdvancedCalculatorGUI:
         # Variables
         self.current_input = tk.StringVar()
         self.result_var = tk.StringVar()
-        self.gst_slabs = {
-            "Exempt (0%)": 0,
-            "5%": 5,
-            "12%": 12,
-            "18%": 18,
-            "28%": 28
-        }
+        self.gst_slabs = dict(GST_SLABS)
+        self.batch_exact = tk.BooleanVar(value=True)
+        self.exact_mode = tk.BooleanVar(value=False)
+        self.precision = tk.IntVar(value=28)
+        self.history_query = tk.StringVar()
+        self.history = CalculationHistory(history_file, history_size)
+        self.history_rows = []
+        self.history_loading = True
+        self.history_backlog = []
+        self._history_search_job = None
         self.selected_gst = tk.StringVar(value="18%")
         
         # Configure styles
@@ -36,6 +1151,18 @@ class AdvancedCalculatorGUI:
         # Bind keyboard events
         self.root.bind('<Key>', self.handle_key_press)
         
+        # Live preview, coalesced so fast typing never waits on evaluation
+        self.live = LiveEvaluator()
+        self._preview_job = None
+        self.current_input.trace_add('write', self.schedule_preview)
+        
+        # Heavy expressions go to a worker process so the UI never freezes;
+        # it is spawned once the history has loaded, off the first paint
+        self.worker = EvaluationWorker(time_limit, memory_limit_mb)
+        self.pending_expression = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(1, self.load_history, self.history.load_steps())
+        
     def create_display(self):
         # Display frame
         display_frame = ttk.Frame(self.root, padding=10)
@@ -51,6 +1178,9 @@ class AdvancedCalculatorGUI:
         result_label = ttk.Label(display_frame, textvariable=self.result_var,
                                font=('Arial', 18), anchor='e')
         result_label.pack(fill=tk.X, pady=5)
+        
+        # Shown only while a background calculation is running
+        self.cancel_button = ttk.Button(display_frame, text="Cancel", command=self.cancel_calculation)
     
     def create_gst_panel(self):
         # GST frame
@@ -70,6 +1200,21 @@ class AdvancedCalculatorGUI:
         ttk.Button(btn_frame, text="Add GST", command=self.add_gst).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Remove GST", command=self.remove_gst).pack(side=tk.LEFT, padx=5)
         ttk.Button(btn_frame, text="Calculate GST", command=self.calculate_gst).pack(side=tk.LEFT, padx=5)
+        
+        # Batch mode over CSV files
+        batch_frame = ttk.Frame(gst_frame)
+        batch_frame.grid(row=2, column=0, columnspan=2, pady=2)
+        ttk.Button(batch_frame, text="Batch GST (CSV)...", command=self.batch_gst).pack(side=tk.LEFT, padx=5)
+        ttk.Checkbutton(batch_frame, text="Exact rounding", variable=self.batch_exact).pack(side=tk.LEFT, padx=5)
+        
+        # Decimal arithmetic for the calculator and the GST buttons
+        exact_frame = ttk.Frame(gst_frame)
+        exact_frame.grid(row=3, column=0, columnspan=2, pady=2)
+        ttk.Checkbutton(exact_frame, text="Exact decimal mode", variable=self.exact_mode,
+                        command=self.on_backend_change).pack(side=tk.LEFT, padx=5)
+        ttk.Label(exact_frame, text="Precision:").pack(side=tk.LEFT)
+        ttk.Spinbox(exact_frame, from_=4, to=200, width=5, textvariable=self.precision,
+                    command=self.on_backend_change).pack(side=tk.LEFT, padx=5)
     
     def create_buttons(self):
         # Button frame
@@ -97,29 +1242,46 @@ class AdvancedCalculatorGUI:
         history_frame = ttk.LabelFrame(self.root, text="Calculation History", padding=10)
         history_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
+        # Search over the whole on-disk history; empty shows the recent entries
+        search_frame = ttk.Frame(history_frame)
+        search_frame.pack(fill=tk.X, pady=(0, 5))
+        ttk.Label(search_frame, text="Search:", font=('Arial', 10)).pack(side=tk.LEFT)
+        self.history_search = ttk.Entry(search_frame, textvariable=self.history_query)
+        self.history_search.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=5)
+        self.history_query.trace_add('write', self.schedule_history_search)
+        
         self.history_text = scrolledtext.ScrolledText(history_frame, height=5, 
                                                     font=('Arial', 10), wrap=tk.WORD)
         self.history_text.pack(fill=tk.BOTH, expand=True)
         self.history_text.configure(state='disabled')
+        # Double-click an entry to load it back into the calculator
+        self.history_text.bind('<Double-Button-1>', self.recall_history)
+    
+    def load_history(self, steps):
+        # One slice of the log per callback so the window stays responsive
+        try:
+            if next(steps, None) is not None:
+                self.root.after(1, self.load_history, steps)
+                return
+        except (OSError, ValueError) as e:
+            messagebox.showerror("History Error", f"Could not load history: {e}")
+        self.history_loading = False
+        # Calculations made while loading go to the log now, in order
+        for record in self.history_backlog:
+            try:
+                self.history.add(record['text'], record['expression'])
+            except (OSError, ValueError):
+                self.history.recent.append(record)
+        self.history_backlog = []
+        self.search_history()
+        self.root.after_idle(self.worker.start)
     
     def handle_key_press(self, event):
-        key = event.char
-        keys_mapping = {
-            '\r': '=',
-            '\x08': '⌫',
-            '\x1b': 'C'
-        }
-        
-        if key in keys_mapping:
-            self.on_button_click(keys_mapping[key])
-        elif key in '0123456789+-*/.()%':
-            self.on_button_click(key)
-        elif event.keysym == 'Escape':
-            self.on_button_click('C')
-        elif event.keysym == 'BackSpace':
-            self.on_button_click('⌫')
-        elif event.keysym == 'Return':
-            self.on_button_click('=')
+        if event.widget is self.history_search:
+            return
+        button = key_to_button(event.char, event.keysym)
+        if button is not None:
+            self.on_button_click(button)
     
     def on_button_click(self, button_text):
         current = self.current_input.get()
@@ -128,18 +1290,10 @@ class AdvancedCalculatorGUI:
             if button_text == 'C':
                 self.current_input.set('')
                 self.result_var.set('')
-            elif button_text == '⌫':
-                self.current_input.set(current[:-1])
             elif button_text == '=':
                 self.calculate_result()
-            elif button_text == '√':
-                self.current_input.set(f"math.sqrt({current})")
-            elif button_text == 'x²':
-                self.current_input.set(f"({current})**2")
-            elif button_text == 'x!':
-                self.current_input.set(f"math.factorial(int({current}))")
             else:
-                self.current_input.set(current + button_text)
+                self.current_input.set(apply_button(current, button_text))
         except Exception as e:
             messagebox.showerror("Error", str(e))
         finally:
@@ -148,58 +1302,316 @@ class AdvancedCalculatorGUI:
     def calculate_result(self):
         try:
             expression = self.current_input.get()
-            if not expression:
+            if not expression or self.pending_expression is not None:
                 return
                 
-            result = eval(expression, {'math': math})
+            result = format_result(evaluate(expression, guard=preview_guard, backend=self.backend()))
             self.result_var.set(f"= {result}")
-            self.add_to_history(f"{expression} = {result}")
+            self.add_to_history(f"{expression} = {result}", expression)
+        except PreviewSkipped:
+            self.start_background_calculation(expression)
         except Exception as e:
             messagebox.showerror("Calculation Error", str(e))
     
-    def add_to_history(self, entry):
+    def start_background_calculation(self, expression):
+        self.pending_expression = expression
+        self.worker.submit(expression, self.backend())
+        self.result_var.set("Computing…")
+        self.cancel_button.pack(anchor='e')
+        self.root.after(50, self.poll_calculation)
+    
+    def poll_calculation(self):
+        if self.pending_expression is None:
+            return
+        outcome = self.worker.poll()
+        if outcome is None:
+            seconds = time.monotonic() - self.worker.started
+            self.result_var.set(f"Computing… {seconds:.1f}s")
+            self.root.after(50, self.poll_calculation)
+            return
+        expression = self.pending_expression
+        self.finish_background_calculation()
+        ok, text = outcome
+        if ok:
+            self.result_var.set(f"= {text}")
+            self.add_to_history(f"{expression} = {text}", expression)
+        else:
+            self.result_var.set('')
+            messagebox.showerror("Calculation Error", text)
+    
+    def cancel_calculation(self):
+        if self.pending_expression is None:
+            return
+        self.worker.cancel()
+        self.finish_background_calculation()
+        self.result_var.set("Cancelled")
+    
+    def finish_background_calculation(self):
+        self.pending_expression = None
+        self.cancel_button.pack_forget()
+    
+    def on_close(self):
+        self.worker.close()
+        self.history.close()
+        self.root.destroy()
+    
+    def backend(self):
+        if not self.exact_mode.get():
+            return FLOAT_BACKEND
+        try:
+            precision = self.precision.get()
+        except tk.TclError:
+            precision = 28
+        return DecimalBackend(max(1, precision))
+    
+    def on_backend_change(self):
+        self.live = LiveEvaluator(backend=self.backend())
+        self.schedule_preview()
+    
+    def schedule_preview(self, *args):
+        if self._preview_job is None:
+            self._preview_job = self.root.after(15, self.update_preview)
+    
+    def update_preview(self):
+        self._preview_job = None
+        expression = self.current_input.get()
+        if not expression.strip():
+            self.live.reset()
+            return
+        try:
+            preview = f"= {format_result(self.live.update(expression))}"
+        except Exception:
+            # Incomplete input, errors and skipped heavy work show nothing
+            return
+        if preview != f"= {expression.strip()}":
+            self.result_var.set(preview)
+    
+    def add_to_history(self, entry, expression=None):
+        if self.history_loading:
+            record = {'text': entry, 'expression': expression}
+            self.history_backlog.append(record)
+        else:
+            try:
+                record = self.history.add(entry, expression)
+            except (OSError, ValueError):
+                # Keep the session history even if the log can't be written
+                record = {'text': entry, 'expression': expression}
+                self.history.recent.append(record)
+        if self.history_query.get().strip():
+            return
         self.history_text.configure(state='normal')
         self.history_text.insert(tk.END, entry + "\n")
+        self.history_rows.append(record)
+        # The widget mirrors the ring buffer, so drop lines that fell out of it
+        while len(self.history_rows) > self.history.recent.maxlen:
+            self.history_text.delete('1.0', '2.0')
+            self.history_rows.pop(0)
         self.history_text.configure(state='disabled')
         self.history_text.see(tk.END)
     
+    def show_history_rows(self, records):
+        self.history_rows = records
+        self.history_text.configure(state='normal')
+        self.history_text.delete('1.0', tk.END)
+        self.history_text.insert(tk.END, ''.join(record['text'] + "\n" for record in records))
+        self.history_text.configure(state='disabled')
+        self.history_text.see(tk.END)
+    
+    def schedule_history_search(self, *args):
+        if self._history_search_job is not None:
+            self.root.after_cancel(self._history_search_job)
+        self._history_search_job = self.root.after(150, self.search_history)
+    
+    def search_history(self):
+        self._history_search_job = None
+        if self.history_loading:
+            # Runs again when loading finishes
+            return
+        query = self.history_query.get().strip()
+        if not query:
+            self.show_history_rows(list(self.history.recent))
+            return
+        try:
+            self.show_history_rows(self.history.search(query))
+        except (OSError, ValueError) as e:
+            messagebox.showerror("History Error", str(e))
+    
+    def recall_history(self, event):
+        row = int(self.history_text.index(f"@{event.x},{event.y}").split('.')[0]) - 1
+        if 0 <= row < len(self.history_rows):
+            record = self.history_rows[row]
+            self.current_input.set(record.get('expression') or record['text'].split(' = ')[0])
+            self.entry.focus_set()
+            self.entry.icursor(tk.END)
+        return 'break'
+    
     def get_gst_rate(self):
         return self.gst_slabs[self.selected_gst.get()]
     
+    def get_amount(self):
+        # Decimal in exact mode so paise are rounded half-up, not as binary floats
+        text = self.current_input.get()
+        if not self.exact_mode.get():
+            return float(text)
+        try:
+            amount = Decimal(text.strip())
+        except InvalidOperation:
+            raise ValueError(f"Invalid amount {text!r}")
+        if not amount.is_finite():
+            raise ValueError(f"Invalid amount {text!r}")
+        return amount
+    
+    def gst_amounts(self, amount, gst_rate, mode='add'):
+        if isinstance(amount, Decimal):
+            # gst_exact widens the precision past the spinbox when it must
+            with decimal.localcontext(self.backend().context):
+                return gst_exact(amount, gst_rate, mode)
+        if mode == 'remove':
+            base_amount = amount / (1 + gst_rate/100)
+            return base_amount, amount - base_amount, amount
+        gst_amount = amount * gst_rate / 100
+        return amount, gst_amount, amount + gst_amount
+    
     def add_gst(self):
         try:
-            amount = float(self.current_input.get())
+            amount = self.get_amount()
             gst_rate = self.get_gst_rate()
-            gst_amount = amount * gst_rate / 100
-            total = amount + gst_amount
+            amount, gst_amount, total = self.gst_amounts(amount, gst_rate)
             self.result_var.set(f"Original: ₹{amount:.2f}\nGST ({gst_rate}%): ₹{gst_amount:.2f}\nTotal: ₹{total:.2f}")
-            self.add_to_history(f"Added {gst_rate}% GST to {amount} = {total}")
+            self.add_to_history(f"Added {gst_rate}% GST to {amount} = {total}", str(amount))
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid amount first")
     
     def remove_gst(self):
         try:
-            total_amount = float(self.current_input.get())
+            total_amount = self.get_amount()
             gst_rate = self.get_gst_rate()
-            base_amount = total_amount / (1 + gst_rate/100)
-            gst_amount = total_amount - base_amount
+            base_amount, gst_amount, total_amount = self.gst_amounts(total_amount, gst_rate, 'remove')
             self.result_var.set(f"Total: ₹{total_amount:.2f}\nGST ({gst_rate}%): ₹{gst_amount:.2f}\nBase: ₹{base_amount:.2f}")
-            self.add_to_history(f"Removed {gst_rate}% GST from {total_amount} = {base_amount}")
+            self.add_to_history(f"Removed {gst_rate}% GST from {total_amount} = {base_amount}", str(total_amount))
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid amount first")
     
     def calculate_gst(self):
         try:
-            amount = float(self.current_input.get())
+            amount = self.get_amount()
             gst_rate = self.get_gst_rate()
-            gst_amount = amount * gst_rate / 100
-            total = amount + gst_amount
+            amount, gst_amount, total = self.gst_amounts(amount, gst_rate)
             self.result_var.set(f"Amount: ₹{amount:.2f}\nGST ({gst_rate}%): ₹{gst_amount:.2f}\nTotal: ₹{total:.2f}")
-            self.add_to_history(f"Calculated {gst_rate}% GST for {amount} = {gst_amount}")
+            self.add_to_history(f"Calculated {gst_rate}% GST for {amount} = {gst_amount}", str(amount))
         except ValueError:
             messagebox.showerror("Error", "Please enter a valid amount first")
 
+    def batch_gst(self):
+        input_path = filedialog.askopenfilename(
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            title="Select amounts to process"
+        )
+        if not input_path:
+            return
+        output_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv")],
+            title="Save GST results to"
+        )
+        if not output_path:
+            return
+        
+        slab = self.selected_gst.get()
+        exact = self.batch_exact.get()
+        outcome = {}
+        
+        def work():
+            try:
+                outcome['stats'] = run_gst_batch(input_path, output_path, slab=slab, exact=exact,
+                                                 progress=lambda rows: outcome.update(rows=rows))
+            except Exception as e:
+                outcome['error'] = e
+        
+        def poll():
+            if worker.is_alive():
+                self.result_var.set(f"Processing... {outcome.get('rows', 0):,} rows")
+                self.root.after(200, poll)
+            elif 'error' in outcome:
+                self.result_var.set('')
+                messagebox.showerror("Batch GST Error", str(outcome['error']))
+            else:
+                stats = outcome['stats']
+                summary = (f"{stats['rows']:,} rows in {stats['seconds']:.2f}s "
+                           f"({stats['rows_per_sec']:,.0f} rows/s, {stats['errors']} errors)")
+                self.result_var.set(f"Batch done: {stats['rows']:,} rows")
+                self.add_to_history(f"Batch {slab} GST: {summary}")
+                messagebox.showinfo("Batch GST", summary)
+        
+        worker = threading.Thread(target=work, daemon=True)
+        worker.start()
+        poll()
+
+
+def startup_probe(**options):
+    # Times a real start of the GUI up to first paint and a loaded history
+    started = time.perf_counter()
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(json.dumps({'error': f"no display: {e}"}))
+        return
+    app = AdvancedCalculatorGUI(root, **options)
+    phases = {'construct_ms': (time.perf_counter() - started) * 1000}
+    root.update()
+    phases['first_paint_ms'] = (time.perf_counter() - started) * 1000
+    while app.history_loading:
+        root.update()
+    phases['history_loaded_ms'] = (time.perf_counter() - started) * 1000
+    phases['history_entries'] = len(app.history.offsets)
+    app.on_close()
+    print(json.dumps(phases))
+
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = AdvancedCalculatorGUI(root)
-    root.mainloop()
\ No newline at end of file
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Advanced Calculator with GST")
+    parser.add_argument('--gst-batch', nargs=2, metavar=('INPUT', 'OUTPUT'),
+                        help="compute GST for every amount in INPUT (CSV) and write OUTPUT")
+    parser.add_argument('--slab', default="18%", help="default slab for rows without one (e.g. 18%%)")
+    parser.add_argument('--mode', choices=('add', 'remove'), default='add',
+                        help="add GST to base amounts or remove it from totals")
+    parser.add_argument('--exact', action='store_true', help="use Decimal with half-up rounding")
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--time-limit', type=float, default=5.0,
+                        help="seconds a heavy calculation may run before it is stopped (0 = no limit)")
+    parser.add_argument('--memory-limit', type=int, default=512,
+                        help="address-space limit in MB for heavy calculations (0 = no limit)")
+    parser.add_argument('--history-file', default=HISTORY_FILE, help="append-only log of past calculations")
+    parser.add_argument('--history-size', type=int, default=200,
+                        help="entries kept in the history panel (older ones stay searchable)")
+    parser.add_argument('--bench', nargs='?', type=int, const=20000, metavar='COUNT',
+                        help="run the headless benchmark over COUNT generated expressions and print JSON")
+    parser.add_argument('--bench-output', help="write the benchmark JSON here instead of stdout")
+    parser.add_argument('--bench-profile', metavar='DIR', help="also dump a cProfile .prof per scenario into DIR")
+    parser.add_argument('--bench-seed', type=int, default=0)
+    parser.add_argument('--startup-report', action='store_true',
+                        help="time imports, first paint and history load of a fresh start and print JSON")
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    if args.startup_probe:
+        startup_probe(time_limit=args.time_limit, memory_limit_mb=args.memory_limit,
+                      history_file=args.history_file, history_size=max(1, args.history_size))
+    elif args.startup_report:
+        from startup_report import run_startup_report
+        run_startup_report(__file__, ['--history-file', args.history_file], args.bench_output,
+                           lazy_modules=('numpy', 'multiprocessing'))
+    elif args.bench:
+        run_benchmark(args.bench, args.bench_seed, args.bench_profile, args.bench_output)
+    elif args.gst_batch:
+        stats = run_gst_batch(*args.gst_batch, slab=args.slab, mode=args.mode, exact=args.exact,
+                              chunk_size=args.chunk_size)
+        print(f"{stats['rows']:,} rows ({stats['errors']} errors) in {stats['seconds']:.2f}s "
+              f"= {stats['rows_per_sec']:,.0f} rows/s [{stats['engine']}]")
+    else:
+        root = tk.Tk()
+        app = AdvancedCalculatorGUI(root, time_limit=args.time_limit, memory_limit_mb=args.memory_limit,
+                                    history_file=args.history_file, history_size=max(1, args.history_size))
+        root.mainloop()
\ No newline at end of file
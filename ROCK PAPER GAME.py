@@ -1,12 +1,664 @@
+import collections
+import functools
+import itertools
+import json
+import math
+import os
 import random
+import socket
+import sys
+import threading
+import time
 
-def rock_paper_scissors():
-    choices = ['rock', 'paper', 'scissors']
+# numpy (--simulate), asyncio (network play) and the process pool
+# (--tournament) are imported where they are used, so a plain game starts
+# without paying for them; _load_numpy() caches numpy or None
+np = None
+_numpy_checked = False
+
+
+def _load_numpy():
+    global np, _numpy_checked
+    if not _numpy_checked:
+        _numpy_checked = True
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+    return np
+
+# Moves are small ints so a round is arithmetic instead of string compares:
+# (a - b) % 3 is 0 for a tie, 1 when a wins and 2 when b wins
+CHOICES = ['rock', 'paper', 'scissors']
+MOVES = {name: index for index, name in enumerate(CHOICES)}
+TIE, WIN, LOSS = 0, 1, 2
+
+
+def outcome(a, b):
+    return (a - b) % 3
+
+
+def random_moves(rng, size):
+    # Uniform player; rng is a numpy Generator, or random.Random without numpy
+    if np is not None:
+        return rng.integers(0, 3, size=size, dtype=np.int8)
+    return [rng.randrange(3) for _ in range(size)]
+
+
+def resolve_batch(a, b):
+    # Outcome of every round in two equal-length move arrays
+    if np is not None:
+        return np.subtract(a, b, dtype=np.int8) % 3
+    return [(x - y) % 3 for x, y in zip(a, b)]
+
+
+def count_outcomes(outcomes):
+    # (ties, a wins, b wins)
+    if np is not None:
+        return tuple(int(count) for count in np.bincount(outcomes, minlength=3))
+    counts = [0, 0, 0]
+    for result in outcomes:
+        counts[result] += 1
+    return tuple(counts)
+
+
+def simulate(rounds, player_a=random_moves, player_b=random_moves, batch_size=1_000_000, seed=None):
+    # Plays `rounds` rounds in batches and returns aggregate scores for a vs b
+    _load_numpy()
+    rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+    ties = a_wins = b_wins = 0
+    started = time.perf_counter()
+    remaining = rounds
+    while remaining > 0:
+        size = min(batch_size, remaining)
+        tie, win, loss = count_outcomes(resolve_batch(player_a(rng, size), player_b(rng, size)))
+        ties += tie
+        a_wins += win
+        b_wins += loss
+        remaining -= size
+    seconds = time.perf_counter() - started
+    return {'rounds': rounds, 'a_wins': a_wins, 'b_wins': b_wins, 'ties': ties,
+            'a_win_rate': a_wins / rounds if rounds else 0.0,
+            'b_win_rate': b_wins / rounds if rounds else 0.0,
+            'tie_rate': ties / rounds if rounds else 0.0,
+            'seconds': seconds, 'rounds_per_sec': rounds / seconds if seconds else 0.0,
+            'engine': 'numpy' if np is not None else 'python'}
+
+
+class Strategy:
+    # A player that picks a move each round and then sees both moves
+    name = 'strategy'
+    
+    def __init__(self, seed=None):
+        self.rng = random.Random(seed)
+    
+    def move(self):
+        raise NotImplementedError
+    
+    def observe(self, own, opponent):
+        pass
+
+
+class RandomStrategy(Strategy):
+    name = 'random'
+    
+    def move(self):
+        return self.rng.randrange(3)
+
+
+class CycleStrategy(Strategy):
+    # rock, paper, scissors, rock, ... - a baseline that learners should beat
+    name = 'cycle'
+    
+    def __init__(self, seed=None):
+        super().__init__(seed)
+        self.next_move = self.rng.randrange(3)
+    
+    def move(self):
+        move = self.next_move
+        self.next_move = (move + 1) % 3
+        return move
+
+
+class MarkovStrategy(Strategy):
+    # Predicts the opponent's next move from the last `order` rounds and
+    # plays what beats it. Counts live in one flat list of 3 per context
+    # (3**order contexts, 9**order with joint=True), the context is rolled
+    # forward arithmetically and only the current context's counts are
+    # decayed, so each round is O(1) with fixed memory however long it runs.
+    name = 'markov'
+    
+    def __init__(self, order=2, decay=0.9, joint=False, seed=None):
+        super().__init__(seed)
+        self.order = order
+        self.decay = decay
+        self.joint = joint
+        self.contexts = (9 if joint else 3) ** order
+        self.counts = [0.0] * (self.contexts * 3)
+        self.context = 0
+        self.seen = 0
+    
+    def predict(self):
+        # Opponent's most likely next move, or None with nothing to go on
+        if self.seen < self.order:
+            return None
+        base = self.context * 3
+        counts = self.counts[base:base + 3]
+        best = max(counts)
+        if best == 0:
+            return None
+        likely = [move for move in range(3) if counts[move] == best]
+        return likely[0] if len(likely) == 1 else self.rng.choice(likely)
+    
+    def move(self):
+        predicted = self.predict()
+        if predicted is None:
+            return self.rng.randrange(3)
+        return (predicted + 1) % 3
+    
+    def observe(self, own, opponent):
+        if self.seen >= self.order:
+            base = self.context * 3
+            counts = self.counts
+            decay = self.decay
+            counts[base] *= decay
+            counts[base + 1] *= decay
+            counts[base + 2] *= decay
+            counts[base + opponent] += 1.0
+        symbol = own * 3 + opponent if self.joint else opponent
+        self.context = (self.context * (9 if self.joint else 3) + symbol) % self.contexts
+        self.seen += 1
+
+
+STRATEGIES = {
+    'random': RandomStrategy,
+    'cycle': CycleStrategy,
+    'frequency': functools.partial(MarkovStrategy, order=0),
+    'markov': MarkovStrategy,
+    'markov-joint': functools.partial(MarkovStrategy, joint=True),
+}
+# Options a strategy spec may set; the seed always comes from the caller
+STRATEGY_OPTIONS = {
+    'random': (),
+    'cycle': (),
+    'frequency': ('decay',),
+    'markov': ('order', 'decay'),
+    'markov-joint': ('order', 'decay'),
+}
+# Markov tables a network client may ask for: order <= 6, or 3 when joint
+MAX_REMOTE_CONTEXTS = 3 ** 6
+
+
+def make_strategy(name, seed=None, **options):
+    try:
+        factory = STRATEGIES[name]
+    except KeyError:
+        raise ValueError(f"Unknown strategy {name!r} (choose from {', '.join(STRATEGIES)})")
+    return factory(seed=seed, **options)
+
+
+def parse_strategy(spec, max_contexts=None):
+    # "markov" or "markov:order=3,decay=0.8" -> (name, options). Only the
+    # options in STRATEGY_OPTIONS are accepted; max_contexts caps the size
+    # of a markov table (the server passes MAX_REMOTE_CONTEXTS).
+    name, _, settings = spec.partition(':')
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {name!r} (choose from {', '.join(STRATEGIES)})")
+    options = {}
+    for setting in filter(None, settings.split(',')):
+        key, _, value = setting.partition('=')
+        key = key.strip()
+        if key not in STRATEGY_OPTIONS[name]:
+            allowed = ', '.join(STRATEGY_OPTIONS[name]) or 'none'
+            raise ValueError(f"Option {key!r} not allowed for {name} (allowed: {allowed})")
+        try:
+            options[key] = int(value) if value.strip().lstrip('-').isdigit() else float(value)
+        except ValueError:
+            raise ValueError(f"Bad option {setting!r} in strategy {spec!r}")
+    check_strategy_options(name, options, max_contexts)
+    return name, options
+
+
+def check_strategy_options(name, options, max_contexts=None):
+    # Range checks shared by strategy specs and the --order/--decay flags
+    if 'order' in options:
+        order = options['order']
+        if not isinstance(order, int) or order < 0:
+            raise ValueError(f"order must be a whole number >= 0, not {order}")
+        if max_contexts is not None:
+            width = 9 if name == 'markov-joint' else 3
+            limit = int(math.log(max_contexts, width) + 1e-9)
+            if order > limit:
+                raise ValueError(f"order must be at most {limit} for {name}")
+    if 'decay' in options and not 0 < options['decay'] <= 1:
+        raise ValueError(f"decay must be in (0, 1], not {options['decay']}")
+
+
+def play_match(player_a, player_b, rounds):
+    # Round-by-round match between two Strategy objects; same stats as simulate
+    ties = a_wins = b_wins = 0
+    started = time.perf_counter()
+    for _ in range(rounds):
+        a = player_a.move()
+        b = player_b.move()
+        result = (a - b) % 3
+        if result == TIE:
+            ties += 1
+        elif result == WIN:
+            a_wins += 1
+        else:
+            b_wins += 1
+        player_a.observe(a, b)
+        player_b.observe(b, a)
+    seconds = time.perf_counter() - started
+    return {'rounds': rounds, 'a_wins': a_wins, 'b_wins': b_wins, 'ties': ties,
+            'a_win_rate': a_wins / rounds if rounds else 0.0,
+            'b_win_rate': b_wins / rounds if rounds else 0.0,
+            'tie_rate': ties / rounds if rounds else 0.0,
+            'seconds': seconds, 'rounds_per_sec': rounds / seconds if seconds else 0.0,
+            'engine': 'python'}
+
+
+def match_seed(seed, match, side):
+    # Fixed per (tournament seed, match, side) so any match can be replayed alone
+    return (seed * 1_000_003 + match) * 2 + side
+
+
+def _run_match(task):
+    # Top level so ProcessPoolExecutor can pickle it
+    match, spec_a, spec_b, rounds, seed = task
+    name_a, options_a = parse_strategy(spec_a)
+    name_b, options_b = parse_strategy(spec_b)
+    stats = play_match(make_strategy(name_a, match_seed(seed, match, 0), **options_a),
+                       make_strategy(name_b, match_seed(seed, match, 1), **options_b), rounds)
+    stats.update(match=match, a=spec_a, b=spec_b)
+    return stats
+
+
+def wilson_interval(successes, trials, z=1.96):
+    if not trials:
+        return 0.0, 0.0
+    p = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (p + z * z / (2 * trials)) / denominator
+    half = z * math.sqrt(p * (1 - p) / trials + z * z / (4 * trials * trials)) / denominator
+    return max(0.0, centre - half), min(1.0, centre + half)
+
+
+def leaderboard(matches):
+    totals = {}
+    for stats in matches:
+        for spec, wins, losses in ((stats['a'], stats['a_wins'], stats['b_wins']),
+                                   (stats['b'], stats['b_wins'], stats['a_wins'])):
+            entry = totals.setdefault(spec, {'strategy': spec, 'matches': 0, 'rounds': 0,
+                                             'wins': 0, 'losses': 0, 'ties': 0})
+            entry['matches'] += 1
+            entry['rounds'] += stats['rounds']
+            entry['wins'] += wins
+            entry['losses'] += losses
+            entry['ties'] += stats['ties']
+    board = []
+    for entry in totals.values():
+        rounds = entry['rounds']
+        entry['win_rate'] = entry['wins'] / rounds if rounds else 0.0
+        entry['win_rate_ci'] = wilson_interval(entry['wins'], rounds)
+        # Ties count half, so 0.5 is break-even against the field
+        entry['score'] = (entry['wins'] + entry['ties'] / 2) / rounds if rounds else 0.0
+        board.append(entry)
+    board.sort(key=lambda entry: entry['score'], reverse=True)
+    return board
+
+
+def run_tournament(specs, rounds, seed=0, repeats=1, workers=None, on_match=None):
+    # Round-robin of every pair, `repeats` times with different seeds. Matches
+    # are independent tasks, so throughput grows with the number of workers
+    # as long as there are at least as many matches as cores.
+    for spec in specs:
+        parse_strategy(spec)
+    pairs = list(itertools.combinations(specs, 2))
+    tasks = [(match, a, b, rounds, seed)
+             for match, (a, b) in enumerate(pair for _ in range(repeats) for pair in pairs)]
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    results = []
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for future in as_completed([pool.submit(_run_match, task) for task in tasks]):
+            stats = future.result()
+            results.append(stats)
+            if on_match is not None:
+                on_match(stats)
+    seconds = time.perf_counter() - started
+    results.sort(key=lambda stats: stats['match'])
+    total = sum(stats['rounds'] for stats in results)
+    return {'strategies': specs, 'rounds_per_match': rounds, 'repeats': repeats, 'seed': seed,
+            'workers': workers or os.cpu_count(), 'seconds': seconds,
+            'rounds_per_sec': total / seconds if seconds else 0.0,
+            'leaderboard': leaderboard(results), 'matches': results}
+
+
+# Text protocol, one command per line (replies in brackets):
+#   HELLO name               [WELCOME name]
+#   PLAY BOT [strategy]      [MATCHED BOT strategy]
+#   PLAY PVP                 [WAITING, later MATCHED opponent]
+#   MOVE rock|paper|scissors [RESULT yours theirs WIN|LOSS|TIE your_score their_score]
+#                            (PVP: WAITING first until the opponent has moved)
+#   SCORE                    [SCORE your_score their_score]
+#   QUIT                     [BYE your_score their_score]
+# An opponent disconnecting sends OPPONENT_LEFT; bad input gets ERROR message.
+RESULT_NAMES = ('TIE', 'WIN', 'LOSS')
+
+
+class Player:
+    def __init__(self, writer):
+        self.writer = writer
+        self.name = 'anonymous'
+        self.session = None
+        self.closed = False
+    
+    def send(self, line):
+        if not self.closed:
+            self.writer.write((line + "\n").encode('utf-8'))
+
+
+class BotSession:
+    def __init__(self, player, strategy):
+        self.player = player
+        self.strategy = strategy
+        self.user_score = 0
+        self.computer_score = 0
+    
+    def score(self, player):
+        return self.user_score, self.computer_score
+    
+    def move(self, player, move):
+        computer_move = self.strategy.move()
+        result = outcome(move, computer_move)
+        self.strategy.observe(computer_move, move)
+        if result == WIN:
+            self.user_score += 1
+        elif result == LOSS:
+            self.computer_score += 1
+        player.send(f"RESULT {CHOICES[move]} {CHOICES[computer_move]} {RESULT_NAMES[result]} "
+                    f"{self.user_score} {self.computer_score}")
+    
+    def leave(self, player):
+        pass
+
+
+class PvpSession:
+    def __init__(self, first, second):
+        self.players = [first, second]
+        self.moves = [None, None]
+        self.scores = [0, 0]
+    
+    def score(self, player):
+        side = self.players.index(player)
+        return self.scores[side], self.scores[1 - side]
+    
+    def move(self, player, move):
+        side = self.players.index(player)
+        if self.moves[side] is not None:
+            player.send("ERROR already moved this round")
+            return
+        self.moves[side] = move
+        if self.moves[1 - side] is None:
+            player.send("WAITING")
+            return
+        result = outcome(self.moves[0], self.moves[1])
+        if result == WIN:
+            self.scores[0] += 1
+        elif result == LOSS:
+            self.scores[1] += 1
+        for side, current in enumerate(self.players):
+            mine, theirs = self.moves[side], self.moves[1 - side]
+            current.send(f"RESULT {CHOICES[mine]} {CHOICES[theirs]} {RESULT_NAMES[outcome(mine, theirs)]} "
+                         f"{self.scores[side]} {self.scores[1 - side]}")
+        self.moves = [None, None]
+    
+    def leave(self, player):
+        other = self.players[1 - self.players.index(player)]
+        other.session = None
+        other.send("OPPONENT_LEFT {} {}".format(*self.score(other)))
+
+
+class GameServer:
+    # One coroutine per connection; sessions are plain objects, so thousands
+    # of games cost only their sockets. PVP players wait in a FIFO queue and
+    # players who disconnect while queued are skipped when popped.
+    def __init__(self, default_strategy='random'):
+        self.default_strategy = default_strategy
+        self.queue = collections.deque()
+        self.connections = 0
+        self.sessions = 0
+        self.commands = {'HELLO': self.hello, 'PLAY': self.play, 'MOVE': self.move, 'SCORE': self.score}
+    
+    async def start(self, host='127.0.0.1', port=5050):
+        import asyncio
+        return await asyncio.start_server(self.handle, host, port, backlog=4096)
+    
+    @staticmethod
+    async def _skip_line(reader, budget=1 << 20):
+        while budget > 0:
+            chunk = await reader.read(min(budget, 1 << 16))
+            if not chunk or b"\n" in chunk:
+                return
+            budget -= len(chunk)
+    
+    async def handle(self, reader, writer):
+        import asyncio
+        
+        player = Player(writer)
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Over the stream limit: answer once and hang up. The rest
+                    # of the line is read off first, as closing a socket with
+                    # unread input resets it and can lose the reply
+                    player.send("ERROR line too long")
+                    await writer.drain()
+                    try:
+                        await asyncio.wait_for(self._skip_line(reader), 1)
+                    except asyncio.TimeoutError:
+                        pass
+                    break
+                if not line:
+                    break
+                command, _, argument = line.decode('utf-8', 'replace').strip().partition(' ')
+                command = command.upper()
+                if command == 'QUIT':
+                    player.send("BYE {} {}".format(*(player.session.score(player) if player.session else (0, 0))))
+                    await writer.drain()
+                    break
+                if command in self.commands:
+                    try:
+                        self.commands[command](player, argument.strip())
+                    except (ValueError, TypeError) as e:
+                        player.send(f"ERROR {e}")
+                    except MemoryError:
+                        player.send(f"ERROR out of memory for {command}")
+                elif command:
+                    player.send(f"ERROR unknown command {command}")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.leave(player)
+            player.closed = True
+            self.connections -= 1
+            writer.close()
+    
+    def hello(self, player, name):
+        player.name = name.split()[0] if name else 'anonymous'
+        player.send(f"WELCOME {player.name}")
+    
+    def play(self, player, argument):
+        mode, _, spec = argument.partition(' ')
+        mode = mode.upper()
+        if player.session is not None or player in self.queue:
+            raise ValueError("already playing")
+        if mode == 'BOT':
+            name, options = parse_strategy(spec.strip() or self.default_strategy, MAX_REMOTE_CONTEXTS)
+            player.session = BotSession(player, make_strategy(name, **options))
+            self.sessions += 1
+            player.send(f"MATCHED BOT {spec.strip() or self.default_strategy}")
+        elif mode == 'PVP':
+            while self.queue and self.queue[0].closed:
+                self.queue.popleft()
+            if not self.queue:
+                self.queue.append(player)
+                player.send("WAITING")
+                return
+            opponent = self.queue.popleft()
+            opponent.session = player.session = PvpSession(opponent, player)
+            self.sessions += 1
+            opponent.send(f"MATCHED {player.name}")
+            player.send(f"MATCHED {opponent.name}")
+        else:
+            raise ValueError("PLAY BOT [strategy] or PLAY PVP")
+    
+    def move(self, player, argument):
+        move = MOVES.get(argument.lower())
+        if move is None:
+            raise ValueError("MOVE rock, paper or scissors")
+        if player.session is None:
+            raise ValueError("not in a game, send PLAY first")
+        player.session.move(player, move)
+    
+    def score(self, player, argument):
+        player.send("SCORE {} {}".format(*(player.session.score(player) if player.session else (0, 0))))
+    
+    def leave(self, player):
+        if player.session is not None:
+            player.session.leave(player)
+            player.session = None
+
+
+def serve(host, port, default_strategy='random'):
+    import asyncio
+    
+    async def main():
+        server = await GameServer(default_strategy).start(host, port)
+        print(f"Serving Rock, Paper, Scissors on {', '.join(str(sock.getsockname()) for sock in server.sockets)}")
+        async with server:
+            await server.serve_forever()
+    
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+def run_client(host, port):
+    # Minimal line client: stdin goes to the server, replies are printed
+    with socket.create_connection((host, port)) as sock:
+        replies = sock.makefile('r', encoding='utf-8')
+        printer = threading.Thread(target=lambda: [print(line, end='', flush=True) for line in replies], daemon=True)
+        printer.start()
+        for line in sys.stdin:
+            sock.sendall(line.encode('utf-8'))
+            if line.strip().upper() == 'QUIT':
+                break
+        printer.join(2)
+
+
+async def _loadgen_session(host, port, index, rounds, mode, latencies):
+    import asyncio
+    
+    reader, writer = await asyncio.open_connection(host, port)
+    
+    async def request(line, expected):
+        writer.write((line + "\n").encode('utf-8'))
+        await writer.drain()
+        while True:
+            reply = await reader.readline()
+            if not reply:
+                raise ConnectionError("server closed the connection")
+            if reply.startswith(expected):
+                return reply
+    
+    rng = random.Random(index)
+    try:
+        await request(f"HELLO load{index}", b"WELCOME")
+        await request("PLAY PVP" if mode == 'pvp' else "PLAY BOT random", b"MATCHED")
+        for _ in range(rounds):
+            started = time.perf_counter()
+            await request(f"MOVE {rng.choice(CHOICES)}", b"RESULT")
+            latencies.append(time.perf_counter() - started)
+        await request("QUIT", b"BYE")
+    finally:
+        writer.close()
+
+
+async def _loadgen(host, port, sessions, rounds, concurrency, mode):
+    import asyncio
+    
+    server = None
+    if host is None:
+        server = await GameServer().start('127.0.0.1', 0)
+        host, port = server.sockets[0].getsockname()[:2]
+    gate = asyncio.Semaphore(concurrency)
+    latencies = []
+    errors = collections.Counter()
+    
+    async def one(index):
+        async with gate:
+            try:
+                await _loadgen_session(host, port, index, rounds, mode, latencies)
+            except (OSError, ConnectionError) as e:
+                errors[type(e).__name__] += 1
+    
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(sessions)))
+    seconds = time.perf_counter() - started
+    if server is not None:
+        server.close()
+        await server.wait_closed()
+    
+    latencies.sort()
+    pick = lambda q: round(latencies[min(len(latencies) - 1, int(len(latencies) * q))] * 1000, 3) if latencies else None
+    return {'mode': mode, 'sessions': sessions, 'rounds_per_session': rounds, 'concurrency': concurrency,
+            'errors': dict(errors), 'seconds': round(seconds, 3),
+            'sessions_per_sec': round(sessions / seconds, 1) if seconds else 0.0,
+            'rounds_per_sec': round(len(latencies) / seconds, 1) if seconds else 0.0,
+            'latency_ms': {'p50': pick(0.50), 'p99': pick(0.99), 'max': pick(1.0)}}
+
+
+def run_loadgen(sessions, rounds=20, concurrency=1000, mode='bot', host=None, port=None):
+    # Without host/port an in-process server on a free port is measured
+    import asyncio
+    
+    if mode == 'pvp':
+        # Everyone needs a partner, and both halves of a pair must be admitted together
+        sessions += sessions % 2
+        concurrency = max(2, concurrency + concurrency % 2)
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+    return asyncio.run(_loadgen(host, port, sessions, rounds, concurrency, mode))
+
+
+def _address(text, default_host='127.0.0.1'):
+    host, _, port = text.rpartition(':')
+    return host or default_host, int(port)
+
+
+def rock_paper_scissors(strategy=None):
+    if strategy is None:
+        strategy = RandomStrategy()
     user_score = 0
     computer_score = 0
     
     print("Welcome to Rock, Paper, Scissors!")
     print("Rules: Rock beats scissors, scissors beat paper, and paper beats rock.")
+    print(f"Computer strategy: {strategy.name}")
     
     while True:
         print("\n--- New Round ---")
@@ -18,21 +670,22 @@ def rock_paper_scissors():
         if user_choice == 'quit':
             break
             
-        if user_choice not in choices:
+        if user_choice not in MOVES:
             print("Invalid choice. Please try again.")
             continue
             
         # Computer selection
-        computer_choice = random.choice(choices)
+        computer_move = strategy.move()
+        computer_choice = CHOICES[computer_move]
         print(f"\nYou chose: {user_choice}")
         print(f"Computer chose: {computer_choice}")
         
         # Determine winner
-        if user_choice == computer_choice:
+        result = outcome(MOVES[user_choice], computer_move)
+        strategy.observe(computer_move, MOVES[user_choice])
+        if result == TIE:
             print("It's a tie!")
-        elif (user_choice == 'rock' and computer_choice == 'scissors') or \
-             (user_choice == 'scissors' and computer_choice == 'paper') or \
-             (user_choice == 'paper' and computer_choice == 'rock'):
+        elif result == WIN:
             print("You win!")
             user_score += 1
         else:
@@ -43,4 +696,95 @@ def rock_paper_scissors():
     print(f"You: {user_score} | Computer: {computer_score}")
     print("Thanks for playing!")
 
-rock_paper_scissors()
\ No newline at end of file
+
+if __name__ == "__main__":
+    import argparse
+    
+    parser = argparse.ArgumentParser(description="Rock, Paper, Scissors")
+    parser.add_argument('--simulate', type=int, metavar='ROUNDS',
+                        help="play ROUNDS rounds headlessly and print the scores")
+    parser.add_argument('--batch-size', type=int, default=1_000_000)
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--strategy', choices=list(STRATEGIES),
+                        help="computer opponent (default random); with --simulate, player A")
+    parser.add_argument('--against', choices=list(STRATEGIES), default='random',
+                        help="player B for --simulate when --strategy is given")
+    parser.add_argument('--order', type=int, help="context length for the markov strategies")
+    parser.add_argument('--decay', type=float, help="per-context count decay for the markov strategies")
+    parser.add_argument('--tournament', nargs='?', const=','.join(STRATEGIES), metavar='SPECS',
+                        help="round-robin between comma-separated strategies (e.g. random,markov:order=3); "
+                             "default all")
+    parser.add_argument('--rounds', type=int, default=100_000, help="rounds per tournament match")
+    parser.add_argument('--repeats', type=int, default=1, help="times each pairing is played")
+    parser.add_argument('--workers', type=int, help="worker processes (default: CPU count)")
+    parser.add_argument('--output', help="write the tournament results as JSON here")
+    parser.add_argument('--serve', metavar='[HOST:]PORT', help="host games over TCP (see the protocol above)")
+    parser.add_argument('--connect', metavar='[HOST:]PORT', help="play against a server from the terminal")
+    parser.add_argument('--loadgen', type=int, metavar='SESSIONS',
+                        help="run SESSIONS client sessions against --target (default: an in-process server)")
+    parser.add_argument('--target', metavar='[HOST:]PORT', help="server for --loadgen")
+    parser.add_argument('--loadgen-mode', choices=('bot', 'pvp'), default='bot')
+    parser.add_argument('--loadgen-rounds', type=int, default=20, help="rounds per load-generator session")
+    parser.add_argument('--concurrency', type=int, default=1000, help="load-generator sessions open at once")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="time the imports and setup of an interactive game and print JSON")
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    
+    options = {key: value for key, value in (('order', args.order), ('decay', args.decay)) if value is not None}
+    try:
+        check_strategy_options('markov', options)
+    except ValueError as e:
+        parser.error(str(e))
+    
+    def strategy(name, seed):
+        return make_strategy(name, seed, **(options if name.startswith('markov') else {}))
+    
+    if args.startup_probe:
+        started = time.perf_counter()
+        strategy(args.strategy or 'random', args.seed)
+        # Stops where the interactive game would print its first prompt
+        print(json.dumps({'ready_ms': (time.perf_counter() - started) * 1000}))
+    elif args.startup_report:
+        from startup_report import run_startup_report
+        run_startup_report(__file__, ['--strategy', args.strategy or 'random'], args.output,
+                           lazy_modules=('numpy', 'asyncio', 'concurrent.futures'))
+    elif args.serve:
+        serve(*_address(args.serve), default_strategy=args.strategy or 'random')
+    elif args.connect:
+        run_client(*_address(args.connect))
+    elif args.loadgen:
+        host, port = _address(args.target) if args.target else (None, None)
+        print(json.dumps(run_loadgen(args.loadgen, args.loadgen_rounds, max(1, args.concurrency),
+                                     args.loadgen_mode, host, port), indent=2))
+    elif args.tournament:
+        def report(stats):
+            # One JSON line per finished match, in completion order
+            print(json.dumps({key: stats[key] for key in ('match', 'a', 'b', 'a_wins', 'b_wins', 'ties')}),
+                  file=sys.stderr)
+        
+        specs = [spec.strip() for spec in args.tournament.split(',') if spec.strip()]
+        results = run_tournament(specs, args.rounds, args.seed or 0, max(1, args.repeats), args.workers, report)
+        print(f"{len(results['matches'])} matches in {results['seconds']:.2f}s "
+              f"= {results['rounds_per_sec']:,.0f} rounds/s on {results['workers']} workers")
+        print(f"{'#':>2}  {'Strategy':<24} {'Score':>6}  {'Win rate':>8}  95% CI")
+        for rank, entry in enumerate(results['leaderboard'], 1):
+            low, high = entry['win_rate_ci']
+            print(f"{rank:>2}  {entry['strategy']:<24} {entry['score']:>6.3f}  "
+                  f"{entry['win_rate']:>8.2%}  [{low:.2%}, {high:.2%}]")
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as file:
+                json.dump(results, file, indent=2)
+    elif args.simulate is not None:
+        if args.strategy:
+            b_seed = None if args.seed is None else args.seed + 1
+            stats = play_match(strategy(args.strategy, args.seed), strategy(args.against, b_seed), args.simulate)
+        else:
+            stats = simulate(args.simulate, batch_size=max(1, args.batch_size), seed=args.seed)
+        print(f"{stats['rounds']:,} rounds in {stats['seconds']:.2f}s "
+              f"= {stats['rounds_per_sec']:,.0f} rounds/s [{stats['engine']}]")
+        print(f"A wins: {stats['a_wins']:,} ({stats['a_win_rate']:.2%}) | "
+              f"B wins: {stats['b_wins']:,} ({stats['b_win_rate']:.2%}) | "
+              f"Ties: {stats['ties']:,} ({stats['tie_rate']:.2%})")
+    else:
+        rock_paper_scissors(strategy(args.strategy or 'random', args.seed))
@@ -1,23 +1,424 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
-from tkcalendar import DateEntry
 
 import json
+import bisect
 import datetime
+import heapq
+import itertools
 import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
 
 TASK_FILE = "gui_todo_data.json"
+TASK_DB = "gui_todo_data.db"
+# Changes within this window are written together (one transaction / rewrite)
+FLUSH_DELAY_MS = 200
+CATEGORIES = ("Important", "Medium", "Less Important", "Personal")
+STATUS_FILTERS = ("All", "Pending", "Done", "Overdue")
+SORT_ORDERS = ("Added", "Deadline", "Category")
+DEADLINE_FORMAT = "%Y-%m-%d %H:%M"
+# Rows inserted into the Treeview per idle callback while a view renders
+RENDER_CHUNK = 500
+# Tasks indexed per callback while the list loads after the window is shown
+LOAD_CHUNK = 5000
+# Tk timers are ints of milliseconds; far-off deadlines re-arm in steps
+MAX_TIMER_MS = 60 * 60 * 1000
+
+
+def parse_deadline(text, today=None):
+    # Full "YYYY-MM-DD HH:MM", or a legacy bare "HH:MM" taken as today
+    text = (text or "").strip()
+    try:
+        return datetime.datetime.strptime(text, DEADLINE_FORMAT)
+    except ValueError:
+        pass
+    try:
+        clock = datetime.datetime.strptime(text, "%H:%M").time()
+    except ValueError:
+        return None
+    return datetime.datetime.combine(today or datetime.date.today(), clock)
+
+
+class PlainDateEntry(ttk.Entry):
+    # Stand-in for tkcalendar's DateEntry: a yyyy-mm-dd field with get_date()
+    def __init__(self, parent, **options):
+        super().__init__(parent, **options)
+        self.insert(0, datetime.date.today().isoformat())
+
+    def get_date(self):
+        return datetime.date.fromisoformat(self.get().strip())
+
+
+def date_entry(parent, **options):
+    # tkcalendar is imported on first use and is optional
+    try:
+        from tkcalendar import DateEntry
+    except ImportError:
+        return PlainDateEntry(parent, **options)
+    return DateEntry(parent, date_pattern="yyyy-mm-dd", **options)
+
+
+class DeadlineScheduler:
+    # Min-heap of (due timestamp, task id) with lazy deletion: cancelling or
+    # rescheduling only updates self.due, and stale heap entries are skipped
+    # when they reach the top. One root.after timer is armed for the earliest
+    # deadline, so each add/cancel/fire is O(log n) and nothing is scanned.
+    def __init__(self, root, on_due):
+        self.root = root
+        self.on_due = on_due
+        self.heap = []
+        self.due = {}
+        self.timer = None
+        self.timer_at = None
+
+    def schedule(self, task_id, when):
+        timestamp = when.timestamp()
+        self.due[task_id] = timestamp
+        heapq.heappush(self.heap, (timestamp, task_id))
+        if self.timer_at is None or timestamp < self.timer_at:
+            self.arm()
+
+    def cancel(self, task_id):
+        self.due.pop(task_id, None)
+        # Rebuild once stale entries dominate so the heap stays O(pending)
+        if len(self.heap) > 64 and len(self.heap) > 2 * len(self.due):
+            self.heap = [(when, task_id) for task_id, when in self.due.items()]
+            heapq.heapify(self.heap)
+
+    def _drop_stale(self):
+        while self.heap and self.due.get(self.heap[0][1]) != self.heap[0][0]:
+            heapq.heappop(self.heap)
+
+    def arm(self):
+        if self.timer is not None:
+            self.root.after_cancel(self.timer)
+            self.timer = None
+            self.timer_at = None
+        self._drop_stale()
+        if not self.heap:
+            return
+        self.timer_at = self.heap[0][0]
+        delay = int((self.timer_at - time.time()) * 1000)
+        self.timer = self.root.after(min(max(delay, 0), MAX_TIMER_MS), self.fire)
+
+    def fire(self):
+        self.timer = None
+        self.timer_at = None
+        now = time.time()
+        fired = []
+        self._drop_stale()
+        while self.heap and self.heap[0][0] <= now:
+            when, task_id = heapq.heappop(self.heap)
+            del self.due[task_id]
+            fired.append(task_id)
+            self._drop_stale()
+        if fired:
+            self.on_due(fired)
+        self.arm()
+
+
+def normalize_tasks(next_id, tasks):
+    # Brings tasks from older files up to date in place: ids for tasks saved
+    # before they had one, and bare "HH:MM" deadlines taken as today.
+    # Returns the next free id and the tasks that changed.
+    changed = []
+    for t in tasks:
+        dirty = False
+        if "id" not in t:
+            t["id"] = next_id
+            dirty = True
+        next_id = max(next_id, t["id"] + 1)
+        due = parse_deadline(t["deadline"])
+        if due is not None and due.strftime(DEADLINE_FORMAT) != t["deadline"]:
+            t["deadline"] = due.strftime(DEADLINE_FORMAT)
+            dirty = True
+        if dirty:
+            changed.append(t)
+    return next_id, changed
+
+
+class JsonTaskStore:
+    # The original format: the whole list rewritten on every flush
+    name = "json"
+
+    def __init__(self, path=TASK_FILE):
+        self.path = path
+        self.tasks = {}
+        self.next_id = 1
+        self.dirty = False
+
+    def load(self):
+        data = {}
+        if os.path.exists(self.path):
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        if isinstance(data, list):
+            # Old files are a bare list of tasks without ids
+            data = {"next_id": 1, "tasks": data}
+        tasks = data.get("tasks", [])
+        self.next_id, changed = normalize_tasks(data.get("next_id", 1), tasks)
+        self.tasks = {t["id"]: t for t in tasks}
+        if changed:
+            self.dirty = True
+            self.flush()
+        return self.next_id, tasks
+
+    def load_chunks(self, size):
+        # The file is parsed in one go; only handing the tasks over is chunked
+        next_id, tasks = self.load()
+        for start in range(0, len(tasks), size):
+            yield tasks[start:start + size]
+
+    def put(self, t, next_id=None):
+        self.tasks[t["id"]] = t
+        if next_id is not None:
+            self.next_id = next_id
+        self.dirty = True
+
+    def delete(self, task_id):
+        self.tasks.pop(task_id, None)
+        self.dirty = True
+
+    def flush(self):
+        if not self.dirty:
+            return
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({"next_id": self.next_id, "tasks": list(self.tasks.values())}, f, indent=4)
+        os.replace(temp_path, self.path)
+        self.dirty = False
+
+    def close(self):
+        self.flush()
+
+
+class SqliteTaskStore:
+    # One row per task in WAL mode. put/delete only queue the change (the
+    # latest one per task wins); flush writes the queue in one transaction.
+    name = "sqlite"
+
+    def __init__(self, path=TASK_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("CREATE TABLE IF NOT EXISTS tasks (id INTEGER PRIMARY KEY, task TEXT NOT NULL, "
+                              "category TEXT NOT NULL, deadline TEXT NOT NULL, done INTEGER NOT NULL)")
+            self.conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+        self.pending = {}
+        self.next_id = None
+
+    def is_empty(self):
+        return self.conn.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+
+    def load(self):
+        tasks = list(itertools.chain.from_iterable(self.load_chunks(LOAD_CHUNK)))
+        return self.next_id, tasks
+
+    def load_chunks(self, size):
+        # Streams the tasks in id order, size rows at a time; next_id is
+        # known before the first chunk and fixes are written after the last
+        stored = self.conn.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+        last = self.conn.execute("SELECT MAX(id) FROM tasks").fetchone()[0]
+        self.next_id = max(stored[0] if stored else 1, last + 1 if last is not None else 1)
+        rows = self.conn.execute("SELECT id, task, category, deadline, done FROM tasks ORDER BY id")
+        while True:
+            batch = rows.fetchmany(size)
+            if not batch:
+                break
+            tasks = [{"id": task_id, "task": task, "category": category, "deadline": deadline, "done": bool(done)}
+                     for task_id, task, category, deadline, done in batch]
+            self.next_id, changed = normalize_tasks(self.next_id, tasks)
+            for t in changed:
+                self.put(t)
+            yield tasks
+        self.flush()
+
+    def import_tasks(self, next_id, tasks):
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?)",
+                                  ((t["id"], t["task"], t["category"], t["deadline"], int(t["done"])) for t in tasks))
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('next_id', ?)", (next_id,))
+        self.next_id = next_id
+
+    def put(self, t, next_id=None):
+        self.pending[t["id"]] = t
+        if next_id is not None:
+            self.next_id = next_id
+
+    def delete(self, task_id):
+        self.pending[task_id] = None
+
+    def flush(self):
+        if not self.pending:
+            return
+        upserts = [(t["id"], t["task"], t["category"], t["deadline"], int(t["done"]))
+                   for t in self.pending.values() if t is not None]
+        deletes = [(task_id,) for task_id, t in self.pending.items() if t is None]
+        with self.conn:
+            self.conn.executemany("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?)", upserts)
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", deletes)
+            self.conn.execute("INSERT OR REPLACE INTO meta VALUES ('next_id', ?)", (self.next_id,))
+        self.pending.clear()
+
+    def close(self):
+        self.flush()
+        self.conn.close()
+
+
+def open_store(kind="sqlite", json_path=TASK_FILE, db_path=TASK_DB):
+    if kind == "json":
+        return JsonTaskStore(json_path)
+    store = SqliteTaskStore(db_path)
+    if os.path.exists(json_path) and store.is_empty():
+        # First run on SQLite: copy the JSON tasks over and keep the file as a backup
+        store.import_tasks(*JsonTaskStore(json_path).load())
+        os.replace(json_path, json_path + ".migrated")
+    return store
+
+
+class TaskIndex:
+    # All tasks by id plus everything the UI asks about, kept up to date on
+    # each change instead of recomputed: id sets by category / done-state /
+    # overdue, running counters, and per (category, done) bucket two sorted
+    # lists - ids (insertion order) and (deadline, id). Overdue tasks are
+    # also kept in a (category, "overdue") bucket of their own. A filtered,
+    # sorted view is a lazy heapq.merge of the matching buckets, so switching
+    # views never sorts or scans the whole task list.
+    def __init__(self):
+        self.tasks = {}
+        self.by_category = defaultdict(set)
+        self.by_done = {False: set(), True: set()}
+        self.overdue = set()
+        self.counts = Counter()
+        self.by_added = defaultdict(list)
+        self.by_deadline = defaultdict(list)
+
+    def __len__(self):
+        return len(self.tasks)
+
+    def _count(self, t, step):
+        state = "done" if t["done"] else "pending"
+        for key in ("total", state):
+            self.counts[key] += step
+            self.counts[t["category"], key] += step
+
+    def add(self, t, bulk=False):
+        # bulk=True appends unsorted; call finish_bulk() once afterwards
+        task_id = t["id"]
+        self.tasks[task_id] = t
+        self.by_category[t["category"]].add(task_id)
+        self.by_done[t["done"]].add(task_id)
+        self._count(t, 1)
+        bucket = (t["category"], t["done"])
+        added = self.by_added[bucket]
+        if bulk or not added or added[-1] < task_id:
+            added.append(task_id)
+        else:
+            bisect.insort(added, task_id)
+        self._insert(self.by_deadline[bucket], (t["deadline"], task_id), bulk)
+
+    @staticmethod
+    def _insert(keys, key, bulk):
+        if bulk:
+            keys.append(key)
+        else:
+            bisect.insort(keys, key)
+
+    @staticmethod
+    def _discard(keys, key):
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+
+    def finish_bulk(self):
+        for keys in itertools.chain(self.by_added.values(), self.by_deadline.values()):
+            keys.sort()
+
+    def remove(self, t):
+        task_id = t["id"]
+        self.set_overdue(task_id, False)
+        del self.tasks[task_id]
+        self.by_category[t["category"]].discard(task_id)
+        self.by_done[t["done"]].discard(task_id)
+        self._count(t, -1)
+        bucket = (t["category"], t["done"])
+        self._discard(self.by_added[bucket], task_id)
+        self._discard(self.by_deadline[bucket], (t["deadline"], task_id))
+
+    def set_done(self, t, done=True):
+        if t["done"] != done:
+            self.remove(t)
+            t["done"] = done
+            self.add(t)
+
+    def set_overdue(self, task_id, overdue, bulk=False):
+        # bulk=True appends unsorted, as in add()
+        if overdue == (task_id in self.overdue):
+            return
+        t = self.tasks[task_id]
+        step = 1 if overdue else -1
+        bucket = (t["category"], "overdue")
+        if overdue:
+            self.overdue.add(task_id)
+            self._insert(self.by_added[bucket], task_id, bulk)
+            self._insert(self.by_deadline[bucket], (t["deadline"], task_id), bulk)
+        else:
+            self.overdue.discard(task_id)
+            self._discard(self.by_added[bucket], task_id)
+            self._discard(self.by_deadline[bucket], (t["deadline"], task_id))
+        self.counts["overdue"] += step
+        self.counts[t["category"], "overdue"] += step
+
+    def categories(self):
+        known = [category for category in self.by_category if category not in CATEGORIES]
+        return list(CATEGORIES) + sorted(known)
+
+    def view(self, category="All", status="All", order="Added"):
+        # Lazily yields task ids for the view, in order
+        categories = self.categories() if category == "All" else [category]
+        states = {"Pending": (False,), "Done": (True,), "Overdue": ("overdue",)}.get(status, (False, True))
+
+        def merged(categories):
+            if order == "Added":
+                return heapq.merge(*(self.by_added[c, state] for c in categories for state in states))
+            keys = heapq.merge(*(self.by_deadline[c, state] for c in categories for state in states))
+            return (task_id for _, task_id in keys)
+
+        if order == "Category":
+            return itertools.chain.from_iterable(merged([c]) for c in categories)
+        return merged(categories)
+
 
 class ToDoApp:
-    def __init__(self, root):
+    def __init__(self, root, store=None):
         self.root = root
         self.root.title("To-Do PRO - GUI Version")
         self.root.geometry("700x550")
 
-        self.tasks = self.load_tasks()
+        self.index = TaskIndex()
+        self.tasks = self.index.tasks
+        self.next_id = 1
+        self.render_job = None
+        self.flush_job = None
+        self.load_job = None
+        self.load_started = False
+        self.loading = True
+        self.store = store if store is not None else open_store()
+        self.scheduler = DeadlineScheduler(self.root, self.on_tasks_due)
 
+        # The window is drawn empty first; once it is on screen, tasks are
+        # read from the store and indexed in chunks from the event loop,
+        # appearing as they load
         self.setup_ui()
-        self.refresh_list()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.bind("<Map>", self.on_map, add="+")
 
     def setup_ui(self):
         title = tk.Label(self.root, text="To-Do List (Hinglish Style)", font=("Arial", 18, "bold"))
@@ -31,112 +432,431 @@ class ToDoApp:
 
         self.category_var = tk.StringVar()
         self.category_combo = ttk.Combobox(self.root, textvariable=self.category_var, state="readonly", font=("Arial", 12))
-        self.category_combo['values'] = ("Important", "Medium", "Less Important", "Personal")
+        self.category_combo['values'] = CATEGORIES
         self.category_combo.current(0)
         self.category_combo.pack(pady=5)
 
-        time_label = tk.Label(self.root, text="Select Deadline (24hr HH:MM):", font=("Arial", 12))
+        time_label = tk.Label(self.root, text="Select Deadline (date + 24hr HH:MM):", font=("Arial", 12))
         time_label.pack(pady=2)
 
-        self.deadline_entry = ttk.Entry(self.root, font=("Arial", 12), width=20)
+        deadline_frame = tk.Frame(self.root)
+        deadline_frame.pack(pady=5)
+        self.date_entry = date_entry(deadline_frame, font=("Arial", 12), width=12)
+        self.date_entry.pack(side=tk.LEFT, padx=5)
+        self.deadline_entry = ttk.Entry(deadline_frame, font=("Arial", 12), width=8)
         self.deadline_entry.insert(0, "14:00")
-        self.deadline_entry.pack(pady=5)
+        self.deadline_entry.pack(side=tk.LEFT, padx=5)
 
         add_btn = tk.Button(self.root, text="Add Task", command=self.add_task, font=("Arial", 12), bg="#4CAF50", fg="white")
         add_btn.pack(pady=5)
+        self.status_label = tk.Label(self.root, text="Loading tasks...", font=("Arial", 10))
+        self.status_label.pack()
+
+        view_frame = tk.Frame(self.root)
+        view_frame.pack(pady=2)
+        self.view_category = tk.StringVar(value="All")
+        self.view_status = tk.StringVar(value="All")
+        self.view_order = tk.StringVar(value="Added")
+        for column, (label, var, values) in enumerate((("Show:", self.view_category, ("All",) + CATEGORIES),
+                                                        ("Status:", self.view_status, STATUS_FILTERS),
+                                                        ("Sort by:", self.view_order, SORT_ORDERS))):
+            tk.Label(view_frame, text=label).grid(row=0, column=column * 2, padx=2)
+            combo = ttk.Combobox(view_frame, textvariable=var, values=values, state="readonly", width=14)
+            combo.grid(row=0, column=column * 2 + 1, padx=2)
+            combo.bind("<<ComboboxSelected>>", lambda event: self.refresh_list())
 
         self.tree = ttk.Treeview(self.root, columns=("Task", "Category", "Deadline", "Status"), show='headings')
         self.tree.heading("Task", text="Task")
         self.tree.heading("Category", text="Category")
         self.tree.heading("Deadline", text="Deadline")
         self.tree.heading("Status", text="Status")
+        self.tree.tag_configure("overdue", foreground="#f44336")
         self.tree.pack(fill=tk.BOTH, expand=True)
 
         button_frame = tk.Frame(self.root)
         button_frame.pack(pady=10)
 
-        tk.Button(button_frame, text="Mark Done", command=self.mark_done, bg="#2196F3", fg="white").grid(row=0, column=0, padx=5)
-        tk.Button(button_frame, text="Delete Task", command=self.delete_task, bg="#f44336", fg="white").grid(row=0, column=1, padx=5)
+        done_btn = tk.Button(button_frame, text="Mark Done", command=self.mark_done, bg="#2196F3", fg="white")
+        done_btn.grid(row=0, column=0, padx=5)
+        delete_btn = tk.Button(button_frame, text="Delete Task", command=self.delete_task, bg="#f44336", fg="white")
+        delete_btn.grid(row=0, column=1, padx=5)
         tk.Button(button_frame, text="Show Stats", command=self.show_stats, bg="#9C27B0", fg="white").grid(row=0, column=2, padx=5)
         tk.Button(button_frame, text="Missed Tasks Taunt", command=self.taunt, bg="#FF9800", fg="black").grid(row=0, column=3, padx=5)
 
+        # Editing waits until the index is out of bulk mode
+        self.edit_buttons = (add_btn, done_btn, delete_btn)
+        for button in self.edit_buttons:
+            button.config(state=tk.DISABLED)
+
+    def on_map(self, event):
+        # The root's bindings also see its children being mapped; the first
+        # map of the window itself starts the load, once it has been drawn
+        if event.widget is not self.root or self.load_started:
+            return
+        self.load_started = True
+        self.root.update_idletasks()
+        self.load_job = self.root.after_idle(self.load_tasks)
+
     def load_tasks(self):
-        if os.path.exists(TASK_FILE):
-            with open(TASK_FILE, 'r') as f:
-                return json.load(f)
-        return []
+        self.view_stale = False
+        self.load_chunk(self.store.load_chunks(LOAD_CHUNK), datetime.datetime.now())
+
+    def load_chunk(self, chunks, now):
+        # Tasks come in id order, so the default "Added" view can show each
+        # chunk as soon as it is indexed; other views wait for the sort
+        self.load_job = None
+        show = self.view_order.get() == "Added" and not self.view_stale
+        try:
+            chunk = next(chunks, None)
+        except (OSError, ValueError, sqlite3.Error) as e:
+            self.loading = False
+            self.status_label.config(text="")
+            messagebox.showerror("Load Error", f"Could not load tasks: {e}")
+            return
+        for t in chunk or ():
+            self.index.add(t, bulk=True)
+            due = parse_deadline(t["deadline"])
+            if due is not None and not t["done"]:
+                if due <= now:
+                    self.index.set_overdue(t["id"], True, bulk=True)
+                else:
+                    self.scheduler.schedule(t["id"], due)
+            if show and self.in_view(t):
+                self.tree.insert('', tk.END, iid=str(t["id"]), values=self.task_values(t), tags=self.task_tags(t))
+        if chunk is not None:
+            self.status_label.config(text=f"Loading tasks... {len(self.tasks):,}")
+            self.load_job = self.root.after(1, self.load_chunk, chunks, now)
+            return
+        self.next_id = self.store.next_id
+        self.loading = False
+        self.index.finish_bulk()
+        self.status_label.config(text="")
+        for button in self.edit_buttons:
+            button.config(state=tk.NORMAL)
+        if not show:
+            self.refresh_list()
+
+    def save_task(self, t):
+        self.store.put(t, self.next_id)
+        self.schedule_flush()
+
+    def forget_task(self, task_id):
+        self.store.delete(task_id)
+        self.schedule_flush()
+
+    def schedule_flush(self):
+        if self.flush_job is None:
+            self.flush_job = self.root.after(FLUSH_DELAY_MS, self.flush_tasks)
 
-    def save_tasks(self):
-        with open(TASK_FILE, 'w') as f:
-            json.dump(self.tasks, f, indent=4)
+    def flush_tasks(self):
+        self.flush_job = None
+        try:
+            self.store.flush()
+        except (OSError, sqlite3.Error) as e:
+            messagebox.showerror("Save Error", f"Could not save tasks: {e}")
+
+    def on_close(self):
+        for job in (self.flush_job, self.load_job):
+            if job is not None:
+                self.root.after_cancel(job)
+        self.flush_job = None
+        self.load_job = None
+        self.store.close()
+        self.root.destroy()
+
+    def selected_task(self):
+        # Treeview iids are task ids, so the selection maps straight to a task
+        selected = self.tree.focus()
+        if not selected:
+            return None
+        return self.tasks.get(int(selected))
+
+    def task_values(self, t):
+        status = "Done" if t["done"] else "Pending"
+        return (t["task"], t["category"], t["deadline"], status)
+
+    def task_tags(self, t):
+        return ("overdue",) if t["id"] in self.index.overdue else ()
+
+    def in_view(self, t):
+        category, status = self.view_category.get(), self.view_status.get()
+        if category != "All" and t["category"] != category:
+            return False
+        if status == "Overdue":
+            return t["id"] in self.index.overdue
+        return status == "All" or t["done"] == (status == "Done")
+
+    def restart_render(self):
+        # A view still rendering pulls rows lazily from the live bucket lists,
+        # so after a change it starts over instead of skipping or repeating rows
+        if self.render_job is None:
+            return False
+        self.refresh_list()
+        return True
+
+    def on_tasks_due(self, task_ids):
+        for task_id in task_ids:
+            self.index.set_overdue(task_id, True)
+            if self.tree.exists(str(task_id)):
+                self.tree.item(str(task_id), tags=("overdue",))
+        if self.view_status.get() == "Overdue" or self.render_job is not None:
+            self.refresh_list()
+        names = [self.tasks[task_id]["task"] for task_id in task_ids]
+        messagebox.showwarning("Deadline Missed!", "\n".join(f"😤 '{name}' ka time ho gaya bhai!" for name in names))
 
     def add_task(self):
         task = self.task_entry.get()
         category = self.category_var.get()
-        deadline = self.deadline_entry.get()
+        try:
+            day = self.date_entry.get_date()
+        except ValueError:
+            messagebox.showerror("Error", "Date must be in YYYY-MM-DD format!")
+            return
+        due = parse_deadline(self.deadline_entry.get(), day)
 
         if not task:
             messagebox.showerror("Error", "Task cannot be empty!")
             return
+        if due is None:
+            messagebox.showerror("Error", "Deadline must be in 24hr HH:MM format!")
+            return
 
-        self.tasks.append({"task": task, "category": category, "deadline": deadline, "done": False})
-        self.save_tasks()
-        self.refresh_list()
+        t = {"id": self.next_id, "task": task, "category": category,
+             "deadline": due.strftime(DEADLINE_FORMAT), "done": False}
+        self.next_id += 1
+        self.index.add(t)
+        if due <= datetime.datetime.now():
+            self.index.set_overdue(t["id"], True)
+        else:
+            self.scheduler.schedule(t["id"], due)
+        self.save_task(t)
+        if not self.restart_render() and self.in_view(t):
+            if self.view_order.get() == "Added":
+                self.tree.insert('', tk.END, iid=str(t["id"]), values=self.task_values(t), tags=self.task_tags(t))
+            else:
+                self.refresh_list()
         self.task_entry.delete(0, tk.END)
         messagebox.showinfo("Added", "Task added successfully! Bhai kamaal ka kaam kiya hai!")
 
     def refresh_list(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for t in self.tasks:
-            status = "Done" if t["done"] else "Pending"
-            self.tree.insert('', tk.END, values=(t["task"], t["category"], t["deadline"], status))
+        # Rows arrive in chunks from the lazy view so the window stays responsive
+        if self.render_job is not None:
+            self.root.after_cancel(self.render_job)
+            self.render_job = None
+        self.tree.delete(*self.tree.get_children())
+        if self.loading:
+            # Buckets are unsorted until loading ends, which redraws the view
+            self.view_stale = True
+            return
+        rows = self.index.view(self.view_category.get(), self.view_status.get(), self.view_order.get())
+        self.render_rows(rows)
+
+    def render_rows(self, rows):
+        self.render_job = None
+        inserted = 0
+        for task_id in itertools.islice(rows, RENDER_CHUNK):
+            t = self.tasks[task_id]
+            self.tree.insert('', tk.END, iid=str(task_id), values=self.task_values(t), tags=self.task_tags(t))
+            inserted += 1
+        if inserted == RENDER_CHUNK:
+            self.render_job = self.root.after(1, self.render_rows, rows)
 
     def mark_done(self):
-        selected = self.tree.focus()
-        if not selected:
+        t = self.selected_task()
+        if t is None:
             messagebox.showwarning("No selection", "Select a task first!")
             return
 
-        task_text = self.tree.item(selected)['values'][0]
-        for t in self.tasks:
-            if t["task"] == task_text:
-                t["done"] = True
-                break
-        self.save_tasks()
-        self.refresh_list()
+        self.index.set_overdue(t["id"], False)
+        self.index.set_done(t)
+        self.scheduler.cancel(t["id"])
+        self.save_task(t)
+        if not self.restart_render():
+            if self.in_view(t):
+                self.tree.item(str(t["id"]), values=self.task_values(t), tags=())
+            else:
+                self.tree.delete(str(t["id"]))
         messagebox.showinfo("Shabaash!", "Task completed! Zindagi mein aage badhne ke liye yahi toh chahiye!")
 
     def delete_task(self):
-        selected = self.tree.focus()
-        if not selected:
+        t = self.selected_task()
+        if t is None:
             messagebox.showwarning("No selection", "Select a task to delete!")
             return
 
-        task_text = self.tree.item(selected)['values'][0]
-        self.tasks = [t for t in self.tasks if t["task"] != task_text]
-        self.save_tasks()
-        self.refresh_list()
+        self.index.remove(t)
+        self.scheduler.cancel(t["id"])
+        self.forget_task(t["id"])
+        if not self.restart_render():
+            self.tree.delete(str(t["id"]))
         messagebox.showinfo("Deleted", "Task removed. Kya kaam ka kaam hata diya! 😎")
 
     def show_stats(self):
-        total = len(self.tasks)
-        done = sum(t['done'] for t in self.tasks)
-        pending = total - done
-        messagebox.showinfo("Stats", f"Total: {total}\nDone: {done}\nPending: {pending}")
+        counts = self.index.counts
+        lines = [f"Total: {counts['total']}", f"Done: {counts['done']}",
+                 f"Pending: {counts['pending']}", f"Overdue: {counts['overdue']}", ""]
+        for category in self.index.categories():
+            if counts[category, "total"]:
+                lines.append(f"{category}: {counts[category, 'total']} "
+                             f"({counts[category, 'pending']} pending, {counts[category, 'overdue']} overdue)")
+        messagebox.showinfo("Stats", "\n".join(lines))
 
     def taunt(self):
-        now = datetime.datetime.now().strftime("%H:%M")
+        # The scheduler keeps the overdue set current, so there is nothing to scan
         taunts = []
-        for t in self.tasks:
-            if not t['done'] and t['deadline'] <= now:
-                taunts.append(f"😤 '{t['task']}' reh gaya bhai! Mummy daantengi ab!")
+        for task_id in sorted(self.index.overdue):
+            t = self.tasks[task_id]
+            taunts.append(f"😤 '{t['task']}' reh gaya bhai! Mummy daantengi ab!")
         if taunts:
             messagebox.showwarning("Taunts Incoming!", "\n".join(taunts))
         else:
             messagebox.showinfo("Good Going!", "Sare kaam time se! Tum toh boss nikle! 😎")
 
+
+def generate_tasks(count, seed=0):
+    rng = random.Random(seed)
+    start = datetime.datetime.now().replace(second=0, microsecond=0)
+    return [{"id": task_id, "task": f"Task {task_id}", "category": rng.choice(CATEGORIES),
+             "deadline": (start + datetime.timedelta(minutes=rng.randint(-10000, 100000))).strftime(DEADLINE_FORMAT),
+             "done": rng.random() < 0.3}
+            for task_id in range(1, count + 1)]
+
+
+def _latency_ms(samples):
+    samples = sorted(samples)
+    pick = lambda q: round(samples[min(len(samples) - 1, int(len(samples) * q))] * 1000, 3)
+    return {'p50': pick(0.50), 'p99': pick(0.99), 'max': pick(1.0)}
+
+
+def bench_store(kind, count, ops, workdir, seed=0):
+    json_path = os.path.join(workdir, f"{kind}.json")
+    db_path = os.path.join(workdir, f"{kind}.db")
+    store = open_store(kind, json_path, db_path)
+    tasks = generate_tasks(count, seed)
+    if kind == "json":
+        for t in tasks:
+            store.put(t, count + 1)
+    else:
+        store.import_tasks(count + 1, tasks)
+    store.close()
+
+    result = {'backend': kind, 'tasks': count, 'ops': ops}
+    started = time.perf_counter()
+    store = open_store(kind, json_path, db_path)
+    next_id, tasks = store.load()
+    result['startup_ms'] = round((time.perf_counter() - started) * 1000, 2)
+
+    # Each change flushed on its own, as a single click would be
+    timings = {'add': [], 'mark_done': [], 'delete': []}
+    added = []
+    for _ in range(ops):
+        t = {"id": next_id, "task": "Bench task", "category": "Medium",
+             "deadline": "2030-01-01 12:00", "done": False}
+        next_id += 1
+        started = time.perf_counter()
+        store.put(t, next_id)
+        store.flush()
+        timings['add'].append(time.perf_counter() - started)
+        added.append(t)
+    for t in added:
+        t["done"] = True
+        started = time.perf_counter()
+        store.put(t)
+        store.flush()
+        timings['mark_done'].append(time.perf_counter() - started)
+    for t in added:
+        started = time.perf_counter()
+        store.delete(t["id"])
+        store.flush()
+        timings['delete'].append(time.perf_counter() - started)
+    result['per_op_ms'] = {name: _latency_ms(samples) for name, samples in timings.items()}
+
+    # A burst of changes inside one flush window
+    started = time.perf_counter()
+    for _ in range(ops):
+        store.put({"id": next_id, "task": "Burst task", "category": "Personal",
+                   "deadline": "2030-01-01 12:00", "done": False}, next_id + 1)
+        next_id += 1
+    store.flush()
+    result['burst_ms'] = round((time.perf_counter() - started) * 1000, 2)
+    store.close()
+    return result
+
+
+def run_storage_benchmark(counts, ops=200, output=None):
+    results = {'python': sys.version.split()[0], 'sqlite': sqlite3.sqlite_version, 'runs': []}
+    for count in counts:
+        for kind in ("json", "sqlite"):
+            with tempfile.TemporaryDirectory() as workdir:
+                run = bench_store(kind, count, ops, workdir)
+            results['runs'].append(run)
+            print(json.dumps(run), file=sys.stderr)
+    text = json.dumps(results, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    return results
+
+
+def startup_probe(storage):
+    # Times one real start: window built, first paint, every task loaded.
+    # Runs on a copy of the task files, as opening a store may migrate or
+    # rewrite them
+    import shutil
+
+    with tempfile.TemporaryDirectory() as workdir:
+        for path in (TASK_FILE, TASK_DB, TASK_DB + "-wal"):
+            if os.path.exists(path):
+                shutil.copy2(path, workdir)
+        started = time.perf_counter()
+        try:
+            root = tk.Tk()
+        except tk.TclError as e:
+            print(json.dumps({'error': f"no display: {e}"}))
+            return
+        app = ToDoApp(root, open_store(storage, os.path.join(workdir, TASK_FILE), os.path.join(workdir, TASK_DB)))
+        phases = {'construct_ms': (time.perf_counter() - started) * 1000}
+
+        def painted(event):
+            # Bound after the app's own <Map> handler, which draws the window
+            if event.widget is root and 'first_paint_ms' not in phases:
+                phases['first_paint_ms'] = (time.perf_counter() - started) * 1000
+
+        root.bind("<Map>", painted, add="+")
+        while app.loading:
+            root.update()
+        phases['loaded_ms'] = (time.perf_counter() - started) * 1000
+        phases['tasks'] = len(app.tasks)
+        app.on_close()
+    print(json.dumps(phases))
+
+
 if __name__ == "__main__":
-    root = tk.Tk()
-    app = ToDoApp(root)
-    root.mainloop()
+    import argparse
+
+    parser = argparse.ArgumentParser(description="To-Do PRO")
+    parser.add_argument('--storage', choices=("sqlite", "json"), default="sqlite",
+                        help="where tasks are kept (an existing JSON file is migrated to SQLite)")
+    parser.add_argument('--bench-storage', nargs='?', const="1000,10000,100000", metavar='COUNTS',
+                        help="compare JSON and SQLite startup and per-change latency for comma-separated task counts")
+    parser.add_argument('--bench-ops', type=int, default=200, help="changes timed per backend and size")
+    parser.add_argument('--bench-output', help="write the benchmark JSON here instead of stdout")
+    parser.add_argument('--startup-report', action='store_true',
+                        help="time imports, first paint and full load of a fresh start and print JSON")
+    parser.add_argument('--startup-probe', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.startup_probe:
+        startup_probe(args.storage)
+    elif args.startup_report:
+        from startup_report import run_startup_report
+        run_startup_report(__file__, ['--storage', args.storage], args.bench_output, lazy_modules=('tkcalendar',))
+    elif args.bench_storage:
+        run_storage_benchmark([int(count) for count in args.bench_storage.split(',')],
+                              max(1, args.bench_ops), args.bench_output)
+    else:
+        root = tk.Tk()
+        app = ToDoApp(root, open_store(args.storage))
+        root.mainloop()
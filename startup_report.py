@@ -0,0 +1,59 @@
+# Startup timing report behind --startup-report in each of the app scripts.
+# The script is started again in a fresh interpreter under -X importtime with
+# --startup-probe; the probe prints one JSON object of phase timings in
+# milliseconds as its last line of output.
+import json
+import os
+import subprocess
+import sys
+import time
+
+
+def import_times(stderr):
+    # (depth, module, cumulative microseconds) for every line of
+    # -X importtime output; depth 0 is a top-level import
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        imports.append((depth, name.strip(), int(cumulative)))
+    return imports
+
+
+def _ms(value):
+    return round(value, 2) if isinstance(value, float) else value
+
+
+def run_startup_report(script, probe_args=(), output=None, lazy_modules=(), top=10):
+    # lazy_modules lists modules the entry point means to keep off its start
+    # path; the report names any that were imported anyway
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, '-X', 'importtime', os.path.abspath(script), '--startup-probe',
+                           *probe_args], capture_output=True, text=True)
+    wall = (time.perf_counter() - started) * 1000
+    imports = import_times(proc.stderr)
+    top_level = sorted(((name, us) for depth, name, us in imports if depth == 0),
+                       key=lambda item: item[1], reverse=True)
+    loaded = {name for _, name, _ in imports}
+    report = {'entry_point': os.path.basename(script),
+              'wall_ms': _ms(wall),
+              'import_ms': _ms(sum(us for _, us in top_level) / 1000),
+              'slowest_imports': [{'module': name, 'ms': _ms(us / 1000)} for name, us in top_level[:top]],
+              'lazy_modules_imported': [name for name in lazy_modules if name in loaded]}
+    try:
+        phases = json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        phases = {'error': (proc.stderr.strip().splitlines() or [''])[-1]}
+    report.update((key, _ms(value)) for key, value in phases.items())
+
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return report
@@ -0,0 +1,245 @@
+import importlib.util
+import json
+import os
+import tempfile
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("address_book", os.path.join(ROOT, "ADRESS BOOK.py"))
+address_book = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(address_book)
+
+
+def build_index(count, **options):
+    store = address_book.ContactStore()
+    index = address_book.ContactSearchIndex(**options)
+    index.add_many([store.add(fields) for fields in address_book.generate_contacts(count)])
+    return store, index
+
+
+def brute_force(store, term):
+    term = term.strip().lower()
+    digits = address_book._digits(term) if set(term) <= address_book.PHONE_CHARS else ''
+    rank = address_book.ContactSearchIndex._rank
+    return {contact.id for contact in store if rank(address_book.ContactSearchIndex._texts(contact), term, digits) is not None}
+
+
+class ContactSearchIndexTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.store, cls.index = build_index(3000, max_results=50)
+
+    def test_rare_terms_find_every_match(self):
+        for term in ("sharma 12", "priya.patel1", "12345", "zzz"):
+            found = {contact.id for contact in self.index.search(term)}
+            self.assertEqual(found, brute_force(self.store, term), term)
+
+    def test_common_terms_are_capped(self):
+        for term in ("main road", "@example.com", "example", "9", "ma", "a"):
+            found = {contact.id for contact in self.index.search(term)}
+            self.assertEqual(len(found), 50, term)
+            self.assertLessEqual(found, brute_force(self.store, term), term)
+
+    def test_name_prefix_hits_come_first_in_name_order(self):
+        results = self.index.search("amit")
+        names = [contact.name.lower() for contact in results]
+        prefixed = [name for name in names if name.startswith("amit")]
+        self.assertEqual(names[:len(prefixed)], sorted(prefixed))
+
+    def test_scan_budget_bounds_the_walk(self):
+        store, index = build_index(3000, max_scan=100)
+        # Every contact has a tier-2 hit on "example"; the budget stops the walk early
+        self.assertLessEqual(len(index.search("xample")), 100)
+
+    def test_edits_keep_the_index_in_step(self):
+        store, index = build_index(200)
+        contact = next(iter(store))
+        renamed = store.update(contact.id, dict(contact.to_dict(), name="Zebediah Quux"))
+        index.replace(contact, renamed)
+        self.assertEqual([c.id for c in index.search("zebediah")], [contact.id])
+        self.assertEqual([c.id for c in index.search("quux")], [contact.id])
+        index.remove(renamed)
+        self.assertEqual(index.search("zebediah"), [])
+
+
+class FakeRoot:
+    # Just enough of Tk's after/after_cancel to drive SearchExecutor
+    def __init__(self):
+        self.jobs = {}
+        self.next_job = 0
+
+    def after(self, ms, func, *args):
+        self.next_job += 1
+        self.jobs[self.next_job] = (time.monotonic() + ms / 1000, func, args)
+        return self.next_job
+
+    def after_cancel(self, job):
+        self.jobs.pop(job, None)
+
+    def run(self, timeout=2):
+        deadline = time.monotonic() + timeout
+        while self.jobs and time.monotonic() < deadline:
+            job, (due, func, args) = min(self.jobs.items(), key=lambda item: item[1][0])
+            time.sleep(max(0, due - time.monotonic()))
+            del self.jobs[job]
+            func(*args)
+
+
+class SearchExecutorTest(unittest.TestCase):
+    def test_failing_search_reaches_on_error_and_stops_polling(self):
+        def search(term, cancelled):
+            raise RuntimeError(f"broken index for {term}")
+
+        root = FakeRoot()
+        errors = []
+        executor = address_book.SearchExecutor(root, search, lambda term, result: self.fail("no result expected"),
+                                  lambda term, error: errors.append(str(error)), debounce_ms=0)
+        executor.submit("ann")
+        root.run()
+        self.assertEqual(errors, ["broken index for ann"])
+        self.assertEqual(root.jobs, {})
+
+    def test_newest_result_is_delivered(self):
+        root = FakeRoot()
+        results = []
+        executor = address_book.SearchExecutor(root, lambda term, cancelled: [term.upper()],
+                                  lambda term, result: results.append(result), debounce_ms=0)
+        executor.submit("a")
+        executor.submit("ab")
+        root.run()
+        self.assertEqual(results, [["AB"]])
+        self.assertEqual(root.jobs, {})
+
+
+class ContactMergerTest(unittest.TestCase):
+    def setUp(self):
+        store = address_book.ContactStore()
+        store.add({'name': 'Asha Rao', 'address': 'Pune'})
+        store.add({'name': 'Asha Rao', 'address': 'Delhi'})
+        store.add({'name': 'Ben', 'phone': '12345'})
+        store.add({'name': 'Carl Diaz', 'phone': '+91 98765 43210', 'email': 'carl@example.com'})
+        self.contacts = list(store)
+        self.merger = address_book.ContactMerger()
+        self.merger.add_existing(self.contacts)
+
+    def test_reimporting_the_same_records_skips_them(self):
+        for contact in self.contacts:
+            self.assertEqual(self.merger.merge(contact.to_dict())[0], 'skip')
+        self.assertEqual(self.merger.summary, {'added': 0, 'merged': 0, 'skipped': 4, 'flagged': 0})
+
+    def test_exact_name_with_a_subset_of_fields_is_skipped(self):
+        action, key, _ = self.merger.merge({'name': 'asha  rao!', 'address': 'Delhi'})
+        self.assertEqual((action, key), ('skip', self.contacts[1].id))
+
+    def test_exact_name_without_conflicts_merges(self):
+        action, key, merged = self.merger.merge({'name': 'Ben', 'phone': '12345', 'notes': 'Gym'})
+        self.assertEqual((action, key, merged['notes']), ('merge', self.contacts[2].id, 'Gym'))
+
+    def test_phone_match_merges_missing_fields(self):
+        action, key, merged = self.merger.merge({'name': 'Carl Diaz', 'phone': '098765 43210', 'address': 'Goa'})
+        self.assertEqual((action, key, merged['address']), ('merge', self.contacts[3].id, 'Goa'))
+
+    def test_conflicting_or_fuzzy_names_are_flagged_and_added(self):
+        self.assertEqual(self.merger.merge({'name': 'Asha Rao', 'address': 'Goa'})[0], 'add')
+        self.assertEqual(self.merger.merge({'name': 'Ashaa Rao'})[0], 'add')
+        self.assertEqual(self.merger.merge({'name': 'Dana Fox'})[0], 'add')
+        self.assertEqual(self.merger.summary['flagged'], 2)
+        self.assertEqual(self.merger.summary['added'], 3)
+
+    def test_records_added_by_the_import_are_matched_too(self):
+        self.assertEqual(self.merger.merge({'name': 'Eve Stone'})[0], 'add')
+        self.assertEqual(self.merger.merge({'name': 'Eve Stone', 'notes': 'Work'})[0], 'merge')
+        self.assertEqual(self.merger.merge({'name': 'Eve Stone'})[0], 'skip')
+
+
+class ContactJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.workdir.name, "contacts.json")
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def snapshot(self):
+        with open(self.path, encoding='utf-8') as file:
+            return json.load(file)
+
+    def write_journal(self, lines):
+        with open(self.path + ".journal", 'wb') as file:
+            file.write(b"".join(lines))
+
+    def record(self, seq, op, **fields):
+        return json.dumps(dict(seq=seq, op=op, **fields)).encode() + b"\n"
+
+    def load(self):
+        journal = address_book.ContactJournal(self.path, compact_min=10 ** 6)
+        contacts = journal.load()
+        journal.close()
+        return journal, {contact.id: contact.name for contact in contacts}
+
+    def test_changes_are_replayed_after_a_restart(self):
+        book = address_book.ContactBookCore(self.path)
+        book.load()
+        ann = book.add({'name': 'Ann'})
+        bob = book.add({'name': 'Bob'})
+        book.update(ann.id, {'name': 'Ann Lee'})
+        book.delete(bob.id)
+        book.add({'name': 'Cy'})
+        book.close()
+        self.assertFalse(os.path.exists(self.path))
+        self.assertEqual(self.load()[1], {1: 'Ann Lee', 3: 'Cy'})
+
+    def test_torn_last_line_is_cut_off(self):
+        self.write_journal([self.record(1, 'add', id=1, contact={'name': 'Ann'}), b'{"seq":2,"op":"ad'])
+        journal, contacts = self.load()
+        self.assertEqual(contacts, {1: 'Ann'})
+        self.assertEqual(journal.skipped_records, 0)
+        with open(self.path + ".journal", 'rb') as file:
+            self.assertEqual(file.read(), self.record(1, 'add', id=1, contact={'name': 'Ann'}))
+
+    def test_corrupt_middle_line_keeps_the_records_after_it(self):
+        lines = [self.record(1, 'add', id=1, contact={'name': 'Ann'}),
+                 b'\x00\x00garbage\n',
+                 self.record(3, 'add', id=2, contact={'name': 'Bob'}),
+                 self.record(4, 'delete', id=7),
+                 self.record(5, 'update', id=1, contact={'name': 'Ann Lee'})]
+        self.write_journal(lines)
+        journal, contacts = self.load()
+        self.assertEqual(contacts, {1: 'Ann Lee', 2: 'Bob'})
+        self.assertEqual(journal.skipped_records, 2)
+        self.assertEqual(journal.seq, 5)
+        with open(self.path + ".journal", 'rb') as file:
+            self.assertEqual(file.read(), b"".join(lines))
+
+    def test_legacy_list_and_positional_records_are_migrated(self):
+        with open(self.path, 'w', encoding='utf-8') as file:
+            json.dump([{'name': 'Ann'}, {'name': 'Bob'}, {'name': 'Cy'}], file)
+        self.write_journal([self.record(1, 'delete', index=0),
+                            self.record(2, 'update', index=1, contact={'name': 'Cy Young'}),
+                            self.record(3, 'add', contact={'name': 'Di'})])
+        journal, contacts = self.load()
+        self.assertEqual(contacts, {2: 'Bob', 3: 'Cy Young', 4: 'Di'})
+        # Migration compacts into an id-keyed snapshot and empties the log
+        snapshot = self.snapshot()
+        self.assertEqual([contact['id'] for contact in snapshot['contacts']], [2, 3, 4])
+        self.assertEqual(snapshot['seq'], 3)
+        self.assertEqual(os.path.getsize(self.path + ".journal"), 0)
+
+    def test_foreground_compaction_waits_for_a_background_one(self):
+        book = address_book.ContactBookCore(self.path)
+        book.load()
+        for fields in address_book.generate_contacts(2000):
+            book.add(fields)
+        book.checkpoint(background=True)
+        book.add({'name': 'Late Arrival'})
+        book.checkpoint(background=False)
+        snapshot = self.snapshot()
+        self.assertEqual(len(snapshot['contacts']), 2001)
+        self.assertEqual(snapshot['seq'], 2001)
+        self.assertFalse(os.path.exists(book.journal.rotated_path))
+        book.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
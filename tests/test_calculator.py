@@ -0,0 +1,134 @@
+import csv
+import importlib.util
+import json
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("calculator", os.path.join(ROOT, "CALCULATOR (2).py"))
+calculator = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(calculator)
+
+
+class PreviewGuardTest(unittest.TestCase):
+    def test_square_goes_through_guard(self):
+        # Repeated squaring doubles the digits each time and must be left to the worker
+        with self.assertRaises(calculator.PreviewSkipped):
+            calculator.evaluate("((((2000!)²)²)²)²", guard=calculator.preview_guard)
+
+    def test_small_square_still_evaluates(self):
+        self.assertEqual(calculator.evaluate("12²", guard=calculator.preview_guard), 144)
+        self.assertEqual(calculator.evaluate("(2000!)²"), calculator.evaluate("(2000!)**2"))
+
+
+class ScientificNotationTest(unittest.TestCase):
+    def test_exponent_literals_evaluate_like_python(self):
+        for text in ("1e5", "2.5E-3*2", "1e+20", ".5e1", "12.", "1e5+1", "3"):
+            self.assertEqual(calculator.evaluate(text), eval(text), text)
+        self.assertEqual(calculator.evaluate("2.5E-3", backend=calculator.DecimalBackend()), Decimal("0.0025"))
+
+    def test_displayed_results_can_be_pasted_back(self):
+        for text in ("1e15*1e5", "2**0.5/1e9"):
+            shown = calculator.format_result(calculator.evaluate(text))
+            self.assertEqual(calculator.evaluate(shown), float(shown))
+
+    def test_live_preview_picks_up_the_exponent(self):
+        live = calculator.LiveEvaluator()
+        self.assertEqual(live.update("1"), 1)
+        with self.assertRaises(calculator.ExpressionError):
+            live.update("1e")
+        self.assertEqual(live.update("1e5"), 100000.0)
+        self.assertEqual(live.update("1e5+2"), 100002.0)
+
+
+class DecimalBackendTest(unittest.TestCase):
+    def test_floor_division_and_modulo_match_float_mode(self):
+        exact = calculator.DecimalBackend()
+        for a in ("7", "-7", "7.5", "-7.5", "6", "-6", "0"):
+            for b in ("2", "-2", "3", "-3", "0.5", "-0.5"):
+                for op in ("//", "%"):
+                    text = f"({a}){op}({b})"
+                    result = calculator.evaluate(text, backend=exact)
+                    self.assertEqual(result, Decimal(str(calculator.evaluate(text))), text)
+                    self.assertNotEqual(str(result), "-0", text)
+
+    def test_live_preview_uses_the_same_operators(self):
+        live = calculator.LiveEvaluator(backend=calculator.DecimalBackend())
+        self.assertEqual(live.update("1 + -7 % 3"), 3)
+        self.assertEqual(live.update("1 + -7 % 3 - -7 // 2"), 7)
+
+
+class GstBatchTest(unittest.TestCase):
+    def run_batch(self, text, **options):
+        with tempfile.TemporaryDirectory() as workdir:
+            source = os.path.join(workdir, "in.csv")
+            target = os.path.join(workdir, "out.csv")
+            with open(source, 'w', encoding='utf-8') as file:
+                file.write(text)
+            stats = calculator.run_gst_batch(source, target, **options)
+            with open(target, newline='', encoding='utf-8') as file:
+                return stats, list(csv.reader(file))
+
+    def test_exact_mode_keeps_every_digit_of_large_amounts(self):
+        stats, rows = self.run_batch("12345678901234567890123456789\n1e400\n", exact=True)
+        self.assertEqual(stats['errors'], 0)
+        self.assertEqual(rows[1][1:4], ["12345678901234567890123456789.00", "2222222202222222220222222222.02",
+                                        "14567901103456790110345679011.02"])
+        self.assertEqual(Decimal(rows[2][3]), Decimal("1.18e400"))
+
+    def test_non_finite_and_oversized_amounts_are_row_errors(self):
+        for exact in (True, False):
+            stats, rows = self.run_batch("inf\nnan\n1e2000\nabc\n100\n", exact=exact)
+            self.assertEqual(stats['errors'], 4)
+            self.assertEqual([row[-1] for row in rows[1:]], ["Invalid amount"] * 4 + [""])
+
+    def test_ragged_rows_line_up_with_the_header(self):
+        stats, rows = self.run_batch("100\n200,5\n")
+        self.assertEqual(rows[0], ["column1", "column2", "base", "gst", "total", "error"])
+        self.assertEqual(rows[1], ["100", "", "100.00", "18.00", "118.00", ""])
+        self.assertEqual(rows[2], ["200", "5", "200.00", "10.00", "210.00", ""])
+        stats, rows = self.run_batch("amount,slab\n100\n200,5,x\n")
+        self.assertEqual(rows[1], ["100", "", "100.00", "18.00", "118.00", ""])
+        self.assertEqual(rows[2], ["200", "5", "", "", "", "More columns than the header"])
+
+    def test_empty_file_reports_its_engine(self):
+        stats, rows = self.run_batch("", exact=True)
+        self.assertEqual((stats['rows'], stats['engine'], rows), (0, 'decimal', []))
+
+
+class CalculationHistoryTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.workdir.name, "history.jsonl")
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def entry(self, text):
+        return json.dumps({'time': 0, 'text': text, 'expression': None}).encode() + b"\n"
+
+    def test_corrupt_middle_line_keeps_later_entries(self):
+        lines = [self.entry("2+2 = 4"), b"not json\n", self.entry("3*7 = 21"), b'{"time": 1, "te']
+        with open(self.path, 'wb') as file:
+            file.write(b"".join(lines))
+        history = calculator.CalculationHistory(self.path)
+        history.load()
+        self.assertEqual(history.skipped, 1)
+        self.assertEqual([record['text'] for record in history.recent], ["2+2 = 4", "3*7 = 21"])
+        # Search reads entries back by offset, so they must point past the bad line
+        self.assertEqual([record['text'] for record in history.search("21")], ["3*7 = 21"])
+        history.add("1+1 = 2")
+        history.close()
+        with open(self.path, 'rb') as file:
+            # Only the torn tail was cut; the bad middle line is left alone
+            self.assertTrue(file.read().startswith(b"".join(lines[:3]) + b'{"time": '))
+        history = calculator.CalculationHistory(self.path)
+        history.load()
+        self.assertEqual([record['text'] for record in history.recent], ["2+2 = 4", "3*7 = 21", "1+1 = 2"])
+        history.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import asyncio
+import importlib.util
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("rock_paper", os.path.join(ROOT, "ROCK PAPER GAME.py"))
+rock_paper = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(rock_paper)
+
+
+class ParseStrategyTest(unittest.TestCase):
+    def test_options(self):
+        self.assertEqual(rock_paper.parse_strategy("markov:order=2,decay=0.5"), ('markov', {'order': 2, 'decay': 0.5}))
+        self.assertEqual(rock_paper.parse_strategy("random"), ('random', {}))
+
+    def test_rejects_bad_specs(self):
+        for spec in ("nope", "random:seed=1", "markov:order=-1", "markov:order=1.5", "frequency:decay=0",
+                     "markov:order=x", "cycle:order=1"):
+            with self.assertRaises(ValueError, msg=spec):
+                rock_paper.parse_strategy(spec)
+
+    def test_remote_order_cap(self):
+        rock_paper.parse_strategy("markov:order=6", rock_paper.MAX_REMOTE_CONTEXTS)
+        rock_paper.parse_strategy("markov-joint:order=3", rock_paper.MAX_REMOTE_CONTEXTS)
+        with self.assertRaises(ValueError):
+            rock_paper.parse_strategy("markov:order=7", rock_paper.MAX_REMOTE_CONTEXTS)
+        with self.assertRaises(ValueError):
+            rock_paper.parse_strategy("markov-joint:order=4", rock_paper.MAX_REMOTE_CONTEXTS)
+
+
+    def test_cli_flags_are_checked_like_specs(self):
+        script = os.path.join(ROOT, "ROCK PAPER GAME.py")
+        for flags in (["--order", "-1"], ["--decay", "2"]):
+            proc = subprocess.run([sys.executable, script, "--simulate", "10", "--strategy", "markov", *flags],
+                                  capture_output=True, text=True)
+            self.assertEqual(proc.returncode, 2, flags)
+            self.assertIn("error:", proc.stderr)
+        proc = subprocess.run([sys.executable, script, "--simulate", "10", "--strategy", "markov", "--order", "0"],
+                              capture_output=True, text=True)
+        self.assertEqual(proc.returncode, 0, proc.stderr)
+
+
+class GameServerTest(unittest.TestCase):
+    def converse(self, lines):
+        # Sends each line and collects one reply per line; stops at EOF
+        async def main():
+            server = await rock_paper.GameServer().start('127.0.0.1', 0)
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            replies = []
+            for line in lines:
+                writer.write(line + b"\n")
+                await writer.drain()
+                reply = await asyncio.wait_for(reader.readline(), 5)
+                if not reply:
+                    break
+                replies.append(reply.decode().strip())
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            return replies
+        return asyncio.run(main())
+
+    def test_bot_game(self):
+        replies = self.converse([b"HELLO ann", b"PLAY BOT cycle", b"MOVE rock", b"SCORE", b"QUIT"])
+        self.assertEqual(replies[:2], ["WELCOME ann", "MATCHED BOT cycle"])
+        self.assertTrue(replies[2].startswith("RESULT rock "))
+        self.assertTrue(replies[3].startswith("SCORE "))
+        self.assertTrue(replies[4].startswith("BYE "))
+
+    def test_failed_commands_answer_error(self):
+        replies = self.converse([b"MOVE rock", b"PLAY BOT markov:order=40", b"PLAY BOT random:seed=3",
+                                 b"PLAY SOLO", b"JUMP", b"SCORE"])
+        self.assertEqual([reply.split()[0] for reply in replies], ["ERROR"] * 5 + ["SCORE"])
+
+    def test_over_long_line_answers_error_and_closes(self):
+        replies = self.converse([b"HELLO " + b"x" * (1 << 17), b"SCORE"])
+        self.assertEqual(replies, ["ERROR line too long"])
+
+
+if __name__ == "__main__":
+    unittest.main()
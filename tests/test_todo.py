@@ -0,0 +1,232 @@
+import datetime
+import importlib.util
+import itertools
+import json
+import os
+import random
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+spec = importlib.util.spec_from_file_location("todo", os.path.join(ROOT, "TO DO LIST.py"))
+todo = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(todo)
+
+
+def task(task_id, category="Medium", deadline="2030-01-01 12:00", done=False):
+    return {"id": task_id, "task": f"Task {task_id}", "category": category, "deadline": deadline, "done": done}
+
+
+class TaskIndexTest(unittest.TestCase):
+    def test_tasks_are_indexed_by_id_category_and_state(self):
+        index = todo.TaskIndex()
+        for t in (task(1), task(2, "Personal"), task(3, done=True)):
+            index.add(t)
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.by_category["Medium"], {1, 3})
+        self.assertEqual(index.by_done[True], {3})
+        index.set_done(index.tasks[1])
+        self.assertEqual(index.by_done[True], {1, 3})
+        self.assertEqual((index.counts["done"], index.counts["pending"]), (2, 1))
+        index.remove(index.tasks[3])
+        self.assertNotIn(3, index.tasks)
+        self.assertEqual(index.by_category["Medium"], {1})
+        self.assertEqual((index.counts["total"], index.counts["Medium", "done"]), (2, 1))
+
+    def test_normalize_gives_old_tasks_ids_and_full_deadlines(self):
+        tasks = [{"task": "a", "category": "Medium", "deadline": "09:30", "done": False},
+                 task(7, deadline="2030-01-01 12:00"),
+                 {"task": "b", "category": "Medium", "deadline": "soon", "done": False}]
+        next_id, changed = todo.normalize_tasks(5, tasks)
+        self.assertEqual([t["id"] for t in tasks], [5, 7, 8])
+        self.assertEqual(next_id, 9)
+        self.assertEqual(tasks[0]["deadline"][-5:], "09:30")
+        self.assertEqual(len(tasks[0]["deadline"]), 16)
+        self.assertEqual(changed, [tasks[0], tasks[2]])
+
+
+class TaskIndexViewTest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        categories = todo.CATEGORIES + ("Errands",)
+        self.tasks = [task(task_id, rng.choice(categories), f"2030-01-{rng.randint(1, 9):02d} 12:00", rng.random() < 0.3)
+                      for task_id in rng.sample(range(1, 1000), 300)]
+        self.overdue = {t["id"] for t in self.tasks if not t["done"] and rng.random() < 0.3}
+
+    def build(self, bulk):
+        index = todo.TaskIndex()
+        for t in self.tasks:
+            index.add(dict(t), bulk=bulk)
+            if t["id"] in self.overdue:
+                index.set_overdue(t["id"], True, bulk=bulk)
+        if bulk:
+            index.finish_bulk()
+        return index
+
+    def expected(self, index, category, status, order):
+        # The view spelled out as a filter and a sort over every task
+        def wanted(t):
+            if category != "All" and t["category"] != category:
+                return False
+            if status == "Overdue":
+                return t["id"] in index.overdue
+            return status == "All" or t["done"] == (status == "Done")
+
+        rows = [t for t in index.tasks.values() if wanted(t)]
+        rank = {c: position for position, c in enumerate(index.categories())}
+        key = {"Added": lambda t: t["id"],
+               "Deadline": lambda t: (t["deadline"], t["id"]),
+               "Category": lambda t: (rank[t["category"]], t["deadline"], t["id"])}[order]
+        return [t["id"] for t in sorted(rows, key=key)]
+
+    def check_views(self, index):
+        for category, status, order in itertools.product(("All",) + tuple(index.categories()),
+                                                         todo.STATUS_FILTERS, todo.SORT_ORDERS):
+            self.assertEqual(list(index.view(category, status, order)), self.expected(index, category, status, order),
+                             (category, status, order))
+
+    def check_counts(self, index):
+        tasks = list(index.tasks.values())
+        self.assertEqual(index.counts["total"], len(tasks))
+        self.assertEqual(index.counts["done"], sum(t["done"] for t in tasks))
+        self.assertEqual(index.counts["overdue"], len(index.overdue))
+        for category in index.categories():
+            self.assertEqual(index.counts[category, "pending"],
+                             sum(t["category"] == category and not t["done"] for t in tasks))
+            self.assertEqual(index.counts[category, "overdue"],
+                             sum(index.tasks[task_id]["category"] == category for task_id in index.overdue))
+
+    def test_views_match_a_full_filter_and_sort(self):
+        for bulk in (False, True):
+            index = self.build(bulk)
+            self.assertEqual(index.categories(), list(todo.CATEGORIES) + ["Errands"])
+            self.check_views(index)
+            self.check_counts(index)
+
+    def test_views_follow_edits(self):
+        index = self.build(bulk=True)
+        ids = sorted(index.tasks)
+        for task_id in ids[:40]:
+            index.set_done(index.tasks[task_id], not index.tasks[task_id]["done"])
+        for task_id in ids[40:60]:
+            index.remove(index.tasks[task_id])
+        for task_id in sorted(index.overdue)[::2]:
+            index.set_overdue(task_id, False)
+        index.add(task(2000, "Personal", "2029-12-31 23:59"))
+        index.set_overdue(2000, True)
+        self.check_views(index)
+        self.check_counts(index)
+
+
+class FakeRoot:
+    # Records root.after timers; tests fire them by hand
+    def __init__(self):
+        self.timers = {}
+        self.next_timer = 0
+
+    def after(self, ms, func, *args):
+        self.next_timer += 1
+        self.timers[self.next_timer] = (ms, func, args)
+        return self.next_timer
+
+    def after_cancel(self, timer):
+        del self.timers[timer]
+
+    def fire(self):
+        # Runs the one pending timer the way Tk's event loop would
+        (timer, (ms, func, args)), = self.timers.items()
+        del self.timers[timer]
+        func(*args)
+
+
+class DeadlineSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.root = FakeRoot()
+        self.fired = []
+        self.scheduler = todo.DeadlineScheduler(self.root, self.fired.append)
+        self.now = datetime.datetime.now()
+
+    def timer(self):
+        self.assertEqual(len(self.root.timers), 1)
+        return next(iter(self.root.timers.values()))[0]
+
+    def test_due_tasks_fire_in_deadline_order_and_the_next_one_is_armed(self):
+        self.scheduler.schedule(1, self.now - datetime.timedelta(minutes=1))
+        self.scheduler.schedule(2, self.now - datetime.timedelta(minutes=5))
+        self.scheduler.schedule(3, self.now + datetime.timedelta(minutes=10))
+        self.assertEqual(self.timer(), 0)
+        self.root.fire()
+        self.assertEqual(self.fired, [[2, 1]])
+        self.assertTrue(9 * 60 * 1000 < self.timer() <= 10 * 60 * 1000)
+
+    def test_cancelled_and_rescheduled_tasks_use_their_latest_state(self):
+        self.scheduler.schedule(1, self.now - datetime.timedelta(minutes=1))
+        self.scheduler.schedule(2, self.now - datetime.timedelta(minutes=1))
+        self.scheduler.cancel(1)
+        self.scheduler.schedule(2, self.now + datetime.timedelta(hours=1))
+        self.root.fire()
+        self.assertEqual(self.fired, [])
+        self.assertEqual(self.scheduler.due, {2: (self.now + datetime.timedelta(hours=1)).timestamp()})
+
+    def test_far_off_deadlines_rearm_in_capped_steps(self):
+        self.scheduler.schedule(1, self.now + datetime.timedelta(days=30))
+        self.assertEqual(self.timer(), todo.MAX_TIMER_MS)
+        self.root.fire()
+        self.assertEqual(self.fired, [])
+        self.assertEqual(self.timer(), todo.MAX_TIMER_MS)
+
+    def test_heap_is_rebuilt_when_mostly_stale(self):
+        for task_id in range(200):
+            self.scheduler.schedule(task_id, self.now + datetime.timedelta(minutes=task_id + 1))
+        for task_id in range(150):
+            self.scheduler.cancel(task_id)
+        self.assertLessEqual(len(self.scheduler.heap), 2 * len(self.scheduler.due))
+        self.assertLessEqual(set(range(150, 200)), {task_id for _, task_id in self.scheduler.heap})
+        self.assertEqual(sorted(self.scheduler.due), list(range(150, 200)))
+
+
+class TaskStoreTest(unittest.TestCase):
+    def setUp(self):
+        self.workdir = tempfile.TemporaryDirectory()
+        self.json_path = os.path.join(self.workdir.name, "tasks.json")
+        self.db_path = os.path.join(self.workdir.name, "tasks.db")
+
+    def tearDown(self):
+        self.workdir.cleanup()
+
+    def test_sqlite_streams_tasks_in_chunks(self):
+        store = todo.open_store("sqlite", self.json_path, self.db_path)
+        tasks = todo.generate_tasks(25)
+        store.import_tasks(40, tasks)
+        store.close()
+
+        store = todo.open_store("sqlite", self.json_path, self.db_path)
+        chunks = store.load_chunks(10)
+        first = next(chunks)
+        self.assertEqual(store.next_id, 40)
+        self.assertEqual([t["id"] for t in first], list(range(1, 11)))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 5])
+        self.assertEqual(store.load(), (40, tasks))
+        store.close()
+
+    def test_json_chunks_match_a_full_load(self):
+        store = todo.open_store("json", self.json_path, self.db_path)
+        for t in todo.generate_tasks(7):
+            store.put(t, 8)
+        store.close()
+        store = todo.open_store("json", self.json_path, self.db_path)
+        chunked = [t for chunk in store.load_chunks(3) for t in chunk]
+        self.assertEqual((store.next_id, chunked), todo.open_store("json", self.json_path, self.db_path).load())
+
+    def test_json_file_is_migrated_to_sqlite_once(self):
+        with open(self.json_path, 'w') as f:
+            json.dump([{"task": "old", "category": "Medium", "deadline": "2030-01-01 09:00", "done": False}], f)
+        store = todo.open_store("sqlite", self.json_path, self.db_path)
+        self.assertEqual(store.load()[1][0]["task"], "old")
+        store.close()
+        self.assertFalse(os.path.exists(self.json_path))
+        self.assertTrue(os.path.exists(self.json_path + ".migrated"))
+
+
+if __name__ == "__main__":
+    unittest.main()